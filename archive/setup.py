@@ -7,66 +7,124 @@ import os
 import sys
 import subprocess
 import json
+import hashlib
 import shutil
+import sysconfig
+import time
+from concurrent.futures import ThreadPoolExecutor
 
-def run_command(command):
-    """Run a command and capture output"""
+CACHE_DIR = os.path.expanduser("~/.cache/mcp-pa")
+
+# Wheelhouses are rebuilt after a week so ">=" requirements pick up new releases
+WHEELHOUSE_MAX_AGE = 7 * 24 * 3600
+
+def run_command(argv, env=None):
+    """Run a command (argv list, no shell) and capture output"""
+    command = " ".join(argv)
     try:
-        result = subprocess.run(command, shell=True, check=True, text=True, capture_output=True)
+        result = subprocess.run(argv, check=True, text=True, capture_output=True, env=env)
         print(f"✓ {command}")
         return True
     except subprocess.CalledProcessError as e:
         print(f"❌ Failed to run: {command}")
         print(f"Error: {e.stderr}")
         return False
+    except OSError as e:
+        print(f"❌ Failed to run: {command}")
+        print(f"Error: {e}")
+        return False
 
 def setup_virtual_environment():
     """Create and activate a virtual environment"""
     print("\n🔧 Setting up virtual environment...")
     
-    if not run_command(f"{sys.executable} -m venv venv"):
-        return False
-    
     # Determine the correct activation command based on OS
     if sys.platform == "win32":
         activate_cmd = "venv\\Scripts\\activate"
         pip_cmd = "venv\\Scripts\\pip"
+        python_cmd = "venv\\Scripts\\python.exe"
     else:
         activate_cmd = "source venv/bin/activate"
         pip_cmd = "venv/bin/pip"
+        python_cmd = "venv/bin/python"
+    
+    # Reuse an existing venv if its interpreter is new enough and has pip
+    if os.path.exists(python_cmd) and subprocess.run(
+        [python_cmd, "-c", "import sys, pip; assert sys.version_info >= (3, 10)"],
+        capture_output=True,
+    ).returncode == 0:
+        print("✓ Reusing existing virtual environment")
+    elif not run_command([sys.executable, "-m", "venv", "venv"]):
+        return False
     
     print(f"ℹ️  To activate the virtual environment, run: {activate_cmd}")
     return pip_cmd
 
+def interpreter_tag(pip_cmd):
+    """Identify the interpreter behind pip_cmd (implementation, version, ABI, platform)"""
+    python_cmd = os.path.join(
+        os.path.dirname(pip_cmd), "python.exe" if sys.platform == "win32" else "python"
+    )
+    query = (
+        "import sys, sysconfig; "
+        "print(sys.implementation.cache_tag + getattr(sys, 'abiflags', '') + '-' + sysconfig.get_platform())"
+    )
+    try:
+        return subprocess.run(
+            [python_cmd, "-c", query], check=True, text=True, capture_output=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return f"{sys.implementation.cache_tag}{getattr(sys, 'abiflags', '')}-{sysconfig.get_platform()}"
+
 def install_dependencies(pip_cmd):
     """Install required dependencies"""
     print("\n📦 Installing dependencies...")
-    return run_command(f"{pip_cmd} install -r requirements.txt")
+    
+    # Wheelhouse is keyed on the interpreter and requirements.txt so unchanged
+    # pins install offline; wheels are not portable across Python versions,
+    # ABIs or platforms
+    with open("requirements.txt", "rb") as f:
+        requirements_hash = hashlib.sha256(f.read()).hexdigest()
+    wheelhouse = os.path.join(CACHE_DIR, "wheels", f"{interpreter_tag(pip_cmd)}-{requirements_hash}")
+    env = dict(os.environ, PIP_CACHE_DIR=os.path.join(CACHE_DIR, "pip"))
+    
+    if os.path.isdir(wheelhouse) and time.time() - os.path.getmtime(wheelhouse) > WHEELHOUSE_MAX_AGE:
+        shutil.rmtree(wheelhouse, ignore_errors=True)
+    
+    if not os.path.isdir(wheelhouse):
+        partial = f"{wheelhouse}.partial"
+        # Discard whatever an interrupted build left behind
+        shutil.rmtree(partial, ignore_errors=True)
+        if run_command([pip_cmd, "wheel", "-r", "requirements.txt", "-w", partial], env):
+            os.replace(partial, wheelhouse)
+    
+    if os.path.isdir(wheelhouse) and run_command(
+        [pip_cmd, "install", "--no-index", "--find-links", wheelhouse, "-r", "requirements.txt"],
+        env,
+    ):
+        return True
+    
+    print("ℹ️  Offline install unavailable, installing from the package index")
+    return run_command([pip_cmd, "install", "-r", "requirements.txt"], env)
 
 def create_directories():
     """Create necessary directories"""
     print("\n📁 Creating directories...")
     
+    # Leaf directories only; makedirs creates the parents
     directories = [
         "data",
     ]
     
     # Add OS-specific directories
     if sys.platform == "darwin":  # macOS
-        directories.extend([
-            os.path.expanduser("~/Library/Application Support/mcp-pa"),
-            os.path.expanduser("~/Library/Application Support/mcp-pa/documents"),
-        ])
+        directories.append(
+            os.path.expanduser("~/Library/Application Support/mcp-pa/documents")
+        )
     elif sys.platform == "win32":  # Windows
-        directories.extend([
-            os.path.expandvars("%APPDATA%\\mcp-pa"),
-            os.path.expandvars("%APPDATA%\\mcp-pa\\documents"),
-        ])
+        directories.append(os.path.expandvars("%APPDATA%\\mcp-pa\\documents"))
     else:  # Linux
-        directories.extend([
-            os.path.expanduser("~/.config/mcp-pa"),
-            os.path.expanduser("~/.config/mcp-pa/documents"),
-        ])
+        directories.append(os.path.expanduser("~/.config/mcp-pa/documents"))
     
     try:
         for directory in directories:
@@ -87,7 +145,7 @@ def test_installation(pip_cmd):
     else:
         python_cmd = "venv/bin/python"
     
-    return run_command(f"{python_cmd} test_server.py")
+    return run_command([python_cmd, "test_server.py"])
 
 def setup_claude_desktop_config():
     """Help setup Claude Desktop configuration"""
@@ -141,13 +199,17 @@ def main():
         print("❌ Failed to setup virtual environment")
         sys.exit(1)
     
-    # Install dependencies
-    if not install_dependencies(pip_cmd):
+    # Install dependencies while creating directories; they don't depend on each other
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        dirs_future = executor.submit(create_directories)
+        install_ok = install_dependencies(pip_cmd)
+        dirs_ok = dirs_future.result()
+    
+    if not install_ok:
         print("❌ Failed to install dependencies")
         sys.exit(1)
     
-    # Create directories
-    if not create_directories():
+    if not dirs_ok:
         print("❌ Failed to create directories")
         sys.exit(1)
     
@@ -7,8 +7,9 @@ outside of Claude Desktop for testing and development.
 """
 
 import sys
-import asyncio
+from datetime import datetime
 from pathlib import Path
+from uuid import uuid4
 
 # Add the src directory to the path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -17,7 +18,7 @@ from src.database_factory import get_database
 from src.models import Project, Todo, CalendarEvent
 
 
-async def main():
+def main():
     """Example usage of the MCP Personal Assistant"""
     print("🚀 MCP Personal Assistant - Basic Usage Example")
     print("=" * 50)
@@ -36,8 +37,7 @@ async def main():
 
         # Create a sample project
         print("\n3. Creating a sample project...")
-        from uuid import uuid4
-        from datetime import datetime
+        now = datetime.now()
         project = db.create_project(Project(
             id=str(uuid4()),
             name="Sample Project",
@@ -45,8 +45,8 @@ async def main():
             status="in_progress",
             priority="medium",
             tags=["example", "test"],
-            created_at=datetime.now(),
-            updated_at=datetime.now(),
+            created_at=now,
+            updated_at=now,
             tasks=[],
             notes=None,
             progress=0,
@@ -64,6 +64,7 @@ async def main():
 
         # Create a sample todo
         print("\n5. Creating a sample todo...")
+        now = datetime.now()
         todo = db.create_todo(Todo(
             id=str(uuid4()),
             title="Test the MCP server",
@@ -71,8 +72,8 @@ async def main():
             completed=False,
             priority="high",
             tags=["testing"],
-            created_at=datetime.now(),
-            updated_at=datetime.now(),
+            created_at=now,
+            updated_at=now,
             project_id=None,
             due_date=None,
             reminder_date=None
@@ -100,4 +101,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -0,0 +1,252 @@
+//! Native validator for dynamic client registration requests.
+//!
+//! Mirrors the common-shape fast path and redirect URI rules of
+//! `DynamicClientRegistry._validate_registration_request` in
+//! `src/auth/client_registry.py`. Requests outside that shape return `None`
+//! so the Python schema path runs instead; the two must be kept in step.
+
+use pyo3::create_exception;
+use pyo3::exceptions::PyValueError;
+use pyo3::prelude::*;
+use pyo3::types::{PyDict, PyList, PyString};
+
+create_exception!(mcp_pa_dcr, RegistrationError, PyValueError);
+
+const MAX_FAST_PATH_REDIRECT_URIS: usize = 3;
+const MAX_REDIRECT_URI_LENGTH: usize = 2048;
+
+const STRING_FIELDS: [&str; 8] = [
+    "client_name",
+    "client_uri",
+    "scope",
+    "logo_uri",
+    "policy_uri",
+    "tos_uri",
+    "software_id",
+    "software_version",
+];
+const SHAPE_FIELDS: [&str; 4] = [
+    "redirect_uris",
+    "grant_types",
+    "response_types",
+    "token_endpoint_auth_method",
+];
+const GRANT_TYPES: [&str; 2] = ["authorization_code", "refresh_token"];
+const AUTH_METHODS: [&str; 5] = [
+    "client_secret_basic",
+    "client_secret_post",
+    "private_key_jwt",
+    "tls_client_auth",
+    "none",
+];
+const LOOPBACK_HOSTS: [&str; 3] = ["localhost", "127.0.0.1", "[::1]"];
+// Loopback URIs with a port are parsed in full: after "host:" the authority
+// may still hold userinfo ("http://localhost:@evil.com/") naming another host
+const LOOPBACK_PREFIXES: [&str; 3] = ["http://localhost/", "http://127.0.0.1/", "http://[::1]/"];
+const DEFAULT_MCP_CAPABILITIES: [&str; 3] = ["resources", "tools", "prompts"];
+
+/// Outcome of checking one redirect URI.
+enum UriCheck {
+    Valid,
+    Invalid(&'static str, String),
+    /// Outside what this port matches exactly; defer to Python.
+    Defer,
+}
+
+/// Extract an exact `str` as UTF-8, or `None` for subclasses and surrogates.
+fn exact_str<'py>(value: &Bound<'py, PyAny>) -> Option<String> {
+    let string = value.downcast_exact::<PyString>().ok()?;
+    string.to_str().ok().map(str::to_owned)
+}
+
+/// Extract an exact `list` of exact `str` items.
+fn exact_str_list<'py>(value: &Bound<'py, PyAny>) -> Option<Vec<String>> {
+    let list = value.downcast_exact::<PyList>().ok()?;
+    list.iter().map(|item| exact_str(&item)).collect()
+}
+
+fn check_redirect_uri(uri: &str) -> UriCheck {
+    // Redirect URIs must not carry a fragment (RFC 6749 section 3.1.2)
+    if uri.contains('#') {
+        return UriCheck::Invalid(
+            "invalid_redirect_uri",
+            format!("Redirect URI must not contain a fragment: {uri}"),
+        );
+    }
+
+    // Common shapes are accepted on a prefix test alone
+    if LOOPBACK_PREFIXES.iter().any(|prefix| uri.starts_with(prefix)) {
+        return UriCheck::Valid;
+    }
+    if let Some(rest) = uri.strip_prefix("https://") {
+        if !matches!(rest.bytes().next(), None | Some(b'/' | b'?' | b':')) {
+            return UriCheck::Valid;
+        }
+    }
+
+    // Python's case-insensitive, Unicode-aware regex differs from a byte scan
+    // outside ASCII, so those URIs go back to the Python path
+    if !uri.is_ascii() {
+        return UriCheck::Defer;
+    }
+
+    match parse_redirect_uri(uri) {
+        None => UriCheck::Invalid("invalid_redirect_uri", format!("Invalid URI: {uri}")),
+        Some((scheme, host)) => {
+            // OAuth 2.1 requires HTTPS for redirect URIs (except localhost)
+            let host = host.to_ascii_lowercase();
+            if !scheme.eq_ignore_ascii_case("https") && !LOOPBACK_HOSTS.contains(&host.as_str()) {
+                UriCheck::Invalid(
+                    "invalid_redirect_uri",
+                    format!("OAuth 2.1 requires HTTPS redirect URIs: {uri}"),
+                )
+            } else {
+                UriCheck::Valid
+            }
+        }
+    }
+}
+
+/// Match `_REDIRECT_URI_RE` on an ASCII URI, returning its scheme and host.
+fn parse_redirect_uri(uri: &str) -> Option<(&str, &str)> {
+    let bytes = uri.as_bytes();
+    let scheme_end = uri.find("://")?;
+    let scheme = &uri[..scheme_end];
+    if !scheme.eq_ignore_ascii_case("http") && !scheme.eq_ignore_ascii_case("https") {
+        return None;
+    }
+
+    let host_start = scheme_end + 3;
+    let host_end = if bytes.get(host_start) == Some(&b'[') {
+        let close = host_start + 1 + uri[host_start + 1..].find(']')?;
+        let literal = &bytes[host_start + 1..close];
+        if literal.is_empty()
+            || !literal.iter().all(|b| b.is_ascii_hexdigit() || *b == b':' || *b == b'.')
+        {
+            return None;
+        }
+        close + 1
+    } else {
+        let len = bytes[host_start..]
+            .iter()
+            .take_while(|b| !matches!(b, b':' | b'/' | b'?' | b'#' | b'[' | b']'))
+            .count();
+        if len == 0 {
+            return None;
+        }
+        host_start + len
+    };
+
+    let mut end = host_end;
+    if bytes.get(end) == Some(&b':') {
+        let digits = bytes[end + 1..].iter().take_while(|b| b.is_ascii_digit()).count();
+        if digits > 0 {
+            end += 1 + digits;
+        }
+    }
+    // `$` also matches before a trailing newline
+    match bytes.get(end) {
+        None | Some(b'/' | b'?' | b'#') => Some((scheme, &uri[host_start..host_end])),
+        Some(b'\n') if end + 1 == bytes.len() => Some((scheme, &uri[host_start..host_end])),
+        _ => None,
+    }
+}
+
+/// Validate a registration request in the common shape.
+///
+/// Returns the validated data as a dict, raises `RegistrationError(error,
+/// description)` for an invalid redirect URI, and returns `None` when the
+/// request (or any update) needs the full Python schema validation.
+#[pyfunction]
+#[pyo3(signature = (data, is_update=false))]
+fn validate_registration<'py>(
+    py: Python<'py>,
+    data: &Bound<'py, PyAny>,
+    is_update: bool,
+) -> PyResult<Option<Bound<'py, PyDict>>> {
+    if is_update {
+        return Ok(None);
+    }
+    let Ok(data) = data.downcast_exact::<PyDict>() else {
+        return Ok(None);
+    };
+    for key in data.keys() {
+        match exact_str(&key) {
+            Some(key)
+                if STRING_FIELDS.contains(&key.as_str()) || SHAPE_FIELDS.contains(&key.as_str()) => {}
+            _ => return Ok(None),
+        }
+    }
+
+    let Some(redirect_uris) = data.get_item("redirect_uris")?.and_then(|v| exact_str_list(&v)) else {
+        return Ok(None);
+    };
+    if redirect_uris.is_empty()
+        || redirect_uris.len() > MAX_FAST_PATH_REDIRECT_URIS
+        || redirect_uris.iter().any(|uri| uri.chars().count() > MAX_REDIRECT_URI_LENGTH)
+    {
+        return Ok(None);
+    }
+
+    let grant_types = match data.get_item("grant_types")? {
+        None => vec![GRANT_TYPES[0].to_owned()],
+        Some(value) => match exact_str_list(&value) {
+            Some(grants) if grants.iter().all(|g| GRANT_TYPES.contains(&g.as_str())) => grants,
+            _ => return Ok(None),
+        },
+    };
+
+    if let Some(value) = data.get_item("response_types")? {
+        if value.ne(PyList::new_bound(py, ["code"]))? {
+            return Ok(None);
+        }
+    }
+
+    let auth_method = match data.get_item("token_endpoint_auth_method")? {
+        None => AUTH_METHODS[0].to_owned(),
+        Some(value) => match exact_str(&value) {
+            Some(method) if AUTH_METHODS.contains(&method.as_str()) => method,
+            _ => return Ok(None),
+        },
+    };
+
+    let validated = PyDict::new_bound(py);
+    for field in STRING_FIELDS {
+        if let Some(value) = data.get_item(field)? {
+            if value.is_none() {
+                continue;
+            }
+            if !value.is_exact_instance_of::<PyString>() {
+                return Ok(None);
+            }
+            if value.is_truthy()? {
+                validated.set_item(field, value)?;
+            }
+        }
+    }
+
+    for uri in &redirect_uris {
+        match check_redirect_uri(uri) {
+            UriCheck::Valid => {}
+            UriCheck::Defer => return Ok(None),
+            UriCheck::Invalid(error, description) => {
+                return Err(RegistrationError::new_err((error, description)));
+            }
+        }
+    }
+
+    validated.set_item("redirect_uris", redirect_uris)?;
+    validated.set_item("grant_types", grant_types)?;
+    validated.set_item("response_types", PyList::new_bound(py, ["code"]))?;
+    validated.set_item("token_endpoint_auth_method", auth_method)?;
+    validated.set_item("mcp_version", "2024-11-05")?;
+    validated.set_item("mcp_capabilities", PyList::new_bound(py, DEFAULT_MCP_CAPABILITIES))?;
+    Ok(Some(validated))
+}
+
+#[pymodule]
+fn mcp_pa_dcr(m: &Bound<'_, PyModule>) -> PyResult<()> {
+    m.add("RegistrationError", m.py().get_type_bound::<RegistrationError>())?;
+    m.add_function(wrap_pyfunction!(validate_registration, m)?)?;
+    Ok(())
+}
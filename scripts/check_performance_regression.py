@@ -6,12 +6,18 @@ Analyzes benchmark results and checks for performance regressions
 against established baselines.
 """
 
+import argparse
 import json
+import math
+import statistics
 import sys
 import os
-from typing import Dict, Any, List, Optional
+from collections import deque
+from typing import Dict, Any, List, NamedTuple, Optional, Tuple
 from datetime import datetime
 
+import numpy as np
+
 # Performance baselines (in milliseconds for mean response time)
 PERFORMANCE_BASELINES = {
     "test_dashboard_benchmark": {
@@ -31,20 +37,161 @@ PERFORMANCE_BASELINES = {
     }
 }
 
+# Baselines laid out as parallel arrays, indexed by test method name
+_BASELINE_INDEX = {name: i for i, name in enumerate(PERFORMANCE_BASELINES)}
+_BASELINE_MEANS = np.array([b['max_mean_time'] for b in PERFORMANCE_BASELINES.values()])
+_BASELINE_STDDEVS = np.array([b['max_stddev'] for b in PERFORMANCE_BASELINES.values()])
+_BASELINE_MEANS_S = _BASELINE_MEANS / 1000
+_BASELINE_STDDEVS_S = _BASELINE_STDDEVS / 1000
+_BASELINE_DESCS = tuple(b['description'] for b in PERFORMANCE_BASELINES.values())
+
+# Regressions and warnings are kept as structured arrays rather than lists of
+# dicts; string widths fit the longest baseline name and description
+FINDING_DTYPE = np.dtype([
+    ('test', f'U{max(map(len, PERFORMANCE_BASELINES), default=1)}'),
+    ('metric', 'U16'),
+    ('actual', 'f8'),
+    ('baseline', 'f8'),
+    ('description', f'U{max(map(len, _BASELINE_DESCS), default=1)}'),
+])
+
+# Append-only history, one JSON object per run; only the tail is read back
+HISTORY_FILE = "performance_history.jsonl"
+LEGACY_HISTORY_FILE = "performance_history.json"
+HISTORY_MAX_ENTRIES = 50
+
+# Significance level for the Welch's t-test against historical runs
+SIGNIFICANCE_LEVEL = 0.05
+
+# The t-test may only downgrade means within this factor of the baseline;
+# anything further over always fails
+NOISE_MARGIN = 1.1
+
+# Per-benchmark summary block printed by analyze_benchmarks
+BENCHMARK_TEMPLATE = (
+    "📈 {desc}:\n"
+    "   Mean: {m:.2f}ms (baseline: {bm:.2f}ms)\n"
+    "   StdDev: {s:.2f}ms (baseline: {bs:.2f}ms)\n"
+    "   Range: {mn:.2f}ms - {mx:.2f}ms"
+)
+
+# Top-level keys of the pytest-benchmark JSON kept alongside the benchmarks
+_RESULT_METADATA_KEYS = ('machine_info', 'commit_info', 'datetime')
+
+
+class Benchmark(NamedTuple):
+    """Timing statistics (in seconds) extracted from a single benchmark entry"""
+    name: str
+    test_method: str
+    mean: float
+    stddev: float
+    min: float
+    max: float
+    rounds: int
+
+
+def _parse_benchmark(benchmark: Dict[str, Any]) -> Benchmark:
+    """Reduce a raw pytest-benchmark entry to the fields the checker uses"""
+    stats = benchmark.get('stats', {})
+    name = benchmark.get('name', 'unknown')
+    return Benchmark(
+        name=name,
+        test_method=name.rpartition('.')[2] or name,
+        mean=stats.get('mean', 0),
+        stddev=stats.get('stddev', 0),
+        min=stats.get('min', 0),
+        max=stats.get('max', 0),
+        rounds=stats.get('rounds', 0)
+    )
+
+
+def _continued_fraction_beta(a: float, b: float, x: float) -> float:
+    """Evaluate the continued fraction of the incomplete beta function (modified Lentz)"""
+    tiny = 1e-300
+    c = 1.0
+    d = 1.0 - (a + b) * x / (a + 1.0)
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    h = d
+    
+    for m in range(1, 201):
+        m2 = 2 * m
+        for numerator in (
+            m * (b - m) * x / ((a + m2 - 1.0) * (a + m2)),
+            -(a + m) * (a + b + m) * x / ((a + m2) * (a + m2 + 1.0)),
+        ):
+            d = 1.0 + numerator * d
+            d = 1.0 / (d if abs(d) > tiny else tiny)
+            c = 1.0 + numerator / c
+            c = c if abs(c) > tiny else tiny
+            delta = c * d
+            h *= delta
+        if abs(delta - 1.0) < 3e-14:
+            break
+    
+    return h
+
+
+def _regularized_incomplete_beta(a: float, b: float, x: float) -> float:
+    """Regularized incomplete beta function I_x(a, b)"""
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+    
+    front = math.exp(
+        math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b)
+        + a * math.log(x) + b * math.log1p(-x)
+    )
+    if x < (a + 1.0) / (a + b + 2.0):
+        return front * _continued_fraction_beta(a, b, x) / a
+    return 1.0 - front * _continued_fraction_beta(b, a, 1.0 - x) / b
+
+
+def welch_t_test(mean1: float, stddev1: float, n1: int,
+                 mean2: float, stddev2: float, n2: int) -> Tuple[float, float]:
+    """Two-sided Welch's t-test from summary statistics, returns (t, p)"""
+    var1 = stddev1 ** 2 / n1
+    var2 = stddev2 ** 2 / n2
+    combined = var1 + var2
+    
+    if combined == 0:
+        return (math.inf if mean1 != mean2 else 0.0), (0.0 if mean1 != mean2 else 1.0)
+    
+    t = (mean1 - mean2) / math.sqrt(combined)
+    df = combined ** 2 / (var1 ** 2 / (n1 - 1) + var2 ** 2 / (n2 - 1))
+    p = _regularized_incomplete_beta(df / 2.0, 0.5, df / (df + t * t))
+    return t, p
+
+
+class RegressionError(Exception):
+    """Raised in fast-fail mode as soon as the first regression is found"""
+    pass
+
+
 class PerformanceRegressionChecker:
     """Check for performance regressions in benchmark results"""
     
-    def __init__(self, benchmark_file: str):
+    def __init__(self, benchmark_file: str, verbose: bool = True, fast_fail: bool = False):
         self.benchmark_file = benchmark_file
+        self.verbose = verbose
+        self.fast_fail = fast_fail
         self.results = None
-        self.regressions = []
-        self.warnings = []
+        self.benchmarks: Optional[List[Benchmark]] = None
+        self.regressions = np.empty(0, dtype=FINDING_DTYPE)
+        self.warnings = np.empty(0, dtype=FINDING_DTYPE)
+        self._out: List[str] = []
         
     def load_results(self) -> bool:
         """Load benchmark results from file"""
         try:
             with open(self.benchmark_file, 'r') as f:
-                self.results = json.load(f)
+                raw = json.load(f)
+            
+            # Keep only the extracted tuples and scalar metadata; the raw tree
+            # (including per-round data) is released as soon as we return
+            self.results = {key: raw[key] for key in _RESULT_METADATA_KEYS if key in raw}
+            if 'benchmarks' in raw:
+                self.benchmarks = [_parse_benchmark(b) for b in raw['benchmarks']]
             return True
         except FileNotFoundError:
             print(f"❌ Benchmark file not found: {self.benchmark_file}")
@@ -58,93 +205,197 @@ class PerformanceRegressionChecker:
     
     def analyze_benchmarks(self) -> None:
         """Analyze benchmark results for regressions"""
-        if not self.results or 'benchmarks' not in self.results:
+        if self.benchmarks is None:
             print("❌ No benchmark data found in results")
             return
         
-        print(f"📊 Analyzing {len(self.results['benchmarks'])} benchmarks...")
-        print()
+        benchmarks = self.benchmarks
+        self._out.append(f"📊 Analyzing {len(benchmarks)} benchmarks...")
+        self._out.append("")
         
-        for benchmark in self.results['benchmarks']:
-            self._check_benchmark_performance(benchmark)
-    
-    def _check_benchmark_performance(self, benchmark: Dict[str, Any]) -> None:
-        """Check individual benchmark performance"""
-        name = benchmark.get('name', 'unknown')
-        fullname = benchmark.get('fullname', name)
+        test_methods = [b.test_method for b in benchmarks]
         
-        # Extract test method name for baseline lookup
-        test_method = name.split('.')[-1] if '.' in name else name
+        known = []
+        rows = []
+        for i, test_method in enumerate(test_methods):
+            idx = _BASELINE_INDEX.get(test_method)
+            if idx is None:
+                if self.verbose:
+                    self._out.append(f"⚠️  No baseline defined for {test_method}")
+                continue
+            known.append(i)
+            rows.append(idx)
         
-        if test_method not in PERFORMANCE_BASELINES:
-            print(f"⚠️  No baseline defined for {test_method}")
+        if not known:
             return
         
-        baseline = PERFORMANCE_BASELINES[test_method]
-        stats = benchmark.get('stats', {})
-        
-        # Get timing statistics (in seconds, convert to milliseconds)
-        mean_time_ms = stats.get('mean', 0) * 1000
-        stddev_ms = stats.get('stddev', 0) * 1000
-        min_time_ms = stats.get('min', 0) * 1000
-        max_time_ms = stats.get('max', 0) * 1000
-        
-        print(f"📈 {baseline['description']}:")
-        print(f"   Mean: {mean_time_ms:.2f}ms (baseline: {baseline['max_mean_time']:.2f}ms)")
-        print(f"   StdDev: {stddev_ms:.2f}ms (baseline: {baseline['max_stddev']:.2f}ms)")
-        print(f"   Range: {min_time_ms:.2f}ms - {max_time_ms:.2f}ms")
-        
-        # Check for regressions
-        regression_found = False
-        
-        if mean_time_ms > baseline['max_mean_time']:
-            self.regressions.append({
-                'test': test_method,
-                'metric': 'mean_time',
-                'actual': mean_time_ms,
-                'baseline': baseline['max_mean_time'],
-                'description': baseline['description']
-            })
-            print(f"   ❌ REGRESSION: Mean time {mean_time_ms:.2f}ms exceeds baseline {baseline['max_mean_time']:.2f}ms")
-            regression_found = True
-        
-        if stddev_ms > baseline['max_stddev']:
-            self.regressions.append({
-                'test': test_method,
-                'metric': 'stddev',
-                'actual': stddev_ms,
-                'baseline': baseline['max_stddev'],
-                'description': baseline['description']
-            })
-            print(f"   ❌ REGRESSION: StdDev {stddev_ms:.2f}ms exceeds baseline {baseline['max_stddev']:.2f}ms")
-            regression_found = True
-        
-        # Check for warnings (approaching limits)
+        selected = [benchmarks[i] for i in known]
+        count = len(selected)
+        
+        # Timing statistics stay in seconds and are compared against baselines
+        # converted to seconds at import; milliseconds are only used for display
+        means_s = np.fromiter((b.mean for b in selected), dtype=float, count=count)
+        stddevs_s = np.fromiter((b.stddev for b in selected), dtype=float, count=count)
+        
+        rows = np.array(rows, dtype=np.intp)
+        baseline_means_s = _BASELINE_MEANS_S[rows]
+        baseline_stddevs_s = _BASELINE_STDDEVS_S[rows]
+        
+        # Check for regressions and warnings (approaching limits) in one pass
         warning_threshold = 0.8  # 80% of baseline
+        mean_regression_mask = means_s > baseline_means_s
+        stddev_regression_mask = stddevs_s > baseline_stddevs_s
+        mean_ratios = means_s / baseline_means_s
+        
+        # A mean just above the baseline (within NOISE_MARGIN) only counts as a
+        # regression when it is also significantly slower than recent history;
+        # such noise-driven excursions are downgraded to warnings. Means further
+        # over, or without history, always fail on the absolute threshold.
+        distribution = self._load_baseline_distribution()
+        p_values = {}
+        
+        for j in np.nonzero(mean_regression_mask & (mean_ratios <= NOISE_MARGIN))[0]:
+            history = distribution.get(test_methods[known[j]])
+            if history is None or selected[j].rounds < 2:
+                continue
+            
+            # History is recorded in milliseconds
+            hist_mean, hist_stddev, hist_n = history
+            mean_ms = means_s[j] * 1000
+            _, p = welch_t_test(mean_ms, stddevs_s[j] * 1000, selected[j].rounds,
+                                hist_mean, hist_stddev, hist_n)
+            p_values[j] = p
+            if p >= SIGNIFICANCE_LEVEL or mean_ms <= hist_mean:
+                mean_regression_mask[j] = False
+        
+        regression_mask = mean_regression_mask | stddev_regression_mask
+        warning_mask = (~regression_mask) & (mean_ratios > warning_threshold)
+        
+        # Each benchmark can regress on both mean and stddev
+        regressions = np.empty(2 * count, dtype=FINDING_DTYPE)
+        n = 0
+        
+        for j in np.nonzero(regression_mask)[0]:
+            test_method = test_methods[known[j]]
+            description = _BASELINE_DESCS[rows[j]]
+            if mean_regression_mask[j]:
+                regressions[n] = (test_method, 'mean_time', means_s[j] * 1000,
+                                  _BASELINE_MEANS[rows[j]], description)
+                n += 1
+            if stddev_regression_mask[j]:
+                regressions[n] = (test_method, 'stddev', stddevs_s[j] * 1000,
+                                  _BASELINE_STDDEVS[rows[j]], description)
+                n += 1
+            
+            if self.fast_fail:
+                self.regressions = regressions[:n]
+                raise RegressionError(f"{description} regressed ({test_method})")
+        
+        self.regressions = regressions[:n]
+        
+        warning_rows = np.nonzero(warning_mask)[0]
+        warnings = np.empty(len(warning_rows), dtype=FINDING_DTYPE)
+        warnings['test'] = [test_methods[known[j]] for j in warning_rows]
+        warnings['metric'] = 'mean_time'
+        warnings['actual'] = means_s[warning_rows] * 1000
+        warnings['baseline'] = _BASELINE_MEANS[rows[warning_rows]]
+        warnings['description'] = [_BASELINE_DESCS[i] for i in rows[warning_rows]]
+        self.warnings = warnings
+        
+        # Only the flagged subset is printed unless verbose output was requested
+        printed = range(count) if self.verbose else np.nonzero(regression_mask | warning_mask)[0]
+        
+        for j in printed:
+            benchmark = selected[j]
+            mean_ms = benchmark.mean * 1000
+            stddev_ms = benchmark.stddev * 1000
+            baseline_mean_ms = _BASELINE_MEANS[rows[j]]
+            baseline_stddev_ms = _BASELINE_STDDEVS[rows[j]]
+            
+            self._out.append(BENCHMARK_TEMPLATE.format_map({
+                'desc': _BASELINE_DESCS[rows[j]],
+                'm': mean_ms,
+                'bm': baseline_mean_ms,
+                's': stddev_ms,
+                'bs': baseline_stddev_ms,
+                'mn': benchmark.min * 1000,
+                'mx': benchmark.max * 1000
+            }))
+            
+            if mean_regression_mask[j]:
+                self._out.append(f"   ❌ REGRESSION: Mean time {mean_ms:.2f}ms exceeds baseline {baseline_mean_ms:.2f}ms")
+            if stddev_regression_mask[j]:
+                self._out.append(f"   ❌ REGRESSION: StdDev {stddev_ms:.2f}ms exceeds baseline {baseline_stddev_ms:.2f}ms")
+            if warning_mask[j]:
+                if j in p_values:
+                    self._out.append(f"   ⚠️  WARNING: Mean time exceeds baseline ({mean_ratios[j]*100:.1f}%) "
+                                     f"but is not significantly slower than recent history (p={p_values[j]:.3f})")
+                else:
+                    self._out.append(f"   ⚠️  WARNING: Mean time approaching baseline ({mean_ratios[j]*100:.1f}%)")
+            elif not regression_mask[j]:
+                self._out.append(f"   ✅ Performance within acceptable range")
+            
+            self._out.append("")
+    
+    def _migrate_legacy_history(self) -> None:
+        """Convert a legacy JSON-array history file to JSON Lines, once"""
+        if os.path.exists(HISTORY_FILE) or not os.path.exists(LEGACY_HISTORY_FILE):
+            return
+        
+        try:
+            with open(LEGACY_HISTORY_FILE, 'r') as f:
+                history = json.load(f)
+            with open(HISTORY_FILE, 'w') as f:
+                f.writelines(json.dumps(entry) + "\n" for entry in history)
+            print(f"📊 Migrated {len(history)} entries from {LEGACY_HISTORY_FILE} to {HISTORY_FILE}")
+        except Exception as e:
+            print(f"⚠️  Could not migrate performance history: {e}")
+    
+    def _load_recent_history(self) -> List[Dict[str, Any]]:
+        """Load the most recent history entries from the tail of the history file"""
+        if not os.path.exists(HISTORY_FILE):
+            return []
+        
+        try:
+            with open(HISTORY_FILE, 'r') as f:
+                lines = deque(f, maxlen=HISTORY_MAX_ENTRIES)
+        except Exception as e:
+            print(f"⚠️  Could not load performance history: {e}")
+            return []
         
-        if not regression_found:
-            if mean_time_ms > baseline['max_mean_time'] * warning_threshold:
-                self.warnings.append({
-                    'test': test_method,
-                    'metric': 'mean_time',
-                    'actual': mean_time_ms,
-                    'baseline': baseline['max_mean_time'],
-                    'percentage': (mean_time_ms / baseline['max_mean_time']) * 100
-                })
-                print(f"   ⚠️  WARNING: Mean time approaching baseline ({mean_time_ms/baseline['max_mean_time']*100:.1f}%)")
-            else:
-                print(f"   ✅ Performance within acceptable range")
-        
-        print()
+        history = []
+        for line in lines:
+            try:
+                history.append(json.loads(line))
+            except json.JSONDecodeError:
+                # Skip blank lines or a line truncated by an interrupted write
+                continue
+        return history
+    
+    def _load_baseline_distribution(self) -> Dict[str, Tuple[float, float, int]]:
+        """Summarize historical mean times per test as (mean, stddev, n) in milliseconds"""
+        history = self._load_recent_history()
+        
+        samples: Dict[str, List[float]] = {}
+        for entry in history:
+            for test_method, stats in entry.get('benchmarks', {}).items():
+                samples.setdefault(test_method, []).append(stats.get('mean_ms', 0))
+        
+        # At least two runs are needed to estimate the historical variance
+        return {
+            test_method: (statistics.fmean(means), statistics.stdev(means), len(means))
+            for test_method, means in samples.items()
+            if len(means) >= 2
+        }
     
     def generate_report(self) -> None:
         """Generate final performance report"""
-        print("=" * 60)
-        print("📋 PERFORMANCE REGRESSION REPORT")
-        print("=" * 60)
+        self._out.append("=" * 60)
+        self._out.append("📋 PERFORMANCE REGRESSION REPORT")
+        self._out.append("=" * 60)
         
-        if not self.results:
-            print("❌ No benchmark results to analyze")
+        if self.results is None:
+            self._out.append("❌ No benchmark results to analyze")
             return
         
         # Summary statistics
@@ -152,68 +403,69 @@ class PerformanceRegressionChecker:
         commit_info = self.results.get('commit_info', {})
         datetime_str = self.results.get('datetime', 'unknown')
         
-        print(f"📅 Test Date: {datetime_str}")
-        print(f"💻 Machine: {machine_info.get('machine', 'unknown')} ({machine_info.get('processor', 'unknown')})")
-        print(f"🐍 Python: {machine_info.get('python_version', 'unknown')}")
+        self._out.append(f"📅 Test Date: {datetime_str}")
+        self._out.append(f"💻 Machine: {machine_info.get('machine', 'unknown')} ({machine_info.get('processor', 'unknown')})")
+        self._out.append(f"🐍 Python: {machine_info.get('python_version', 'unknown')}")
         
         if commit_info:
-            print(f"🔧 Commit: {commit_info.get('id', 'unknown')[:8]}")
-            print(f"🌿 Branch: {commit_info.get('branch', 'unknown')}")
+            self._out.append(f"🔧 Commit: {commit_info.get('id', 'unknown')[:8]}")
+            self._out.append(f"🌿 Branch: {commit_info.get('branch', 'unknown')}")
         
-        print()
+        self._out.append("")
         
         # Regression summary
-        if self.regressions:
-            print(f"❌ REGRESSIONS FOUND: {len(self.regressions)}")
-            print()
+        if len(self.regressions):
+            self._out.append(f"❌ REGRESSIONS FOUND: {len(self.regressions)}")
+            self._out.append("")
             
-            for regression in self.regressions:
-                print(f"   • {regression['description']} ({regression['metric']})")
-                print(f"     Actual: {regression['actual']:.2f}ms")
-                print(f"     Baseline: {regression['baseline']:.2f}ms")
-                print(f"     Regression: {((regression['actual'] / regression['baseline'] - 1) * 100):+.1f}%")
-                print()
+            # Worst regressions first
+            order = np.argsort(self.regressions['actual'] / self.regressions['baseline'])[::-1]
+            
+            for regression in self.regressions[order]:
+                self._out.append(f"   • {regression['description']} ({regression['metric']})")
+                self._out.append(f"     Actual: {regression['actual']:.2f}ms")
+                self._out.append(f"     Baseline: {regression['baseline']:.2f}ms")
+                self._out.append(f"     Regression: {((regression['actual'] / regression['baseline'] - 1) * 100):+.1f}%")
+                self._out.append("")
         else:
-            print("✅ NO REGRESSIONS FOUND")
+            self._out.append("✅ NO REGRESSIONS FOUND")
         
         # Warning summary
-        if self.warnings:
-            print(f"⚠️  PERFORMANCE WARNINGS: {len(self.warnings)}")
-            print()
+        if len(self.warnings):
+            self._out.append(f"⚠️  PERFORMANCE WARNINGS: {len(self.warnings)}")
+            self._out.append("")
             
             for warning in self.warnings:
-                print(f"   • {warning['test']} ({warning['metric']}): {warning['percentage']:.1f}% of baseline")
+                percentage = warning['actual'] / warning['baseline'] * 100
+                self._out.append(f"   • {warning['test']} ({warning['metric']}): {percentage:.1f}% of baseline")
         else:
-            print("✅ NO PERFORMANCE WARNINGS")
+            self._out.append("✅ NO PERFORMANCE WARNINGS")
         
-        print()
+        self._out.append("")
         
         # Overall status
-        if self.regressions:
-            print("🚨 OVERALL STATUS: PERFORMANCE REGRESSION DETECTED")
+        if len(self.regressions):
+            self._out.append("🚨 OVERALL STATUS: PERFORMANCE REGRESSION DETECTED")
             return False
-        elif self.warnings:
-            print("⚠️  OVERALL STATUS: PERFORMANCE WARNINGS (acceptable)")
+        elif len(self.warnings):
+            self._out.append("⚠️  OVERALL STATUS: PERFORMANCE WARNINGS (acceptable)")
             return True
         else:
-            print("✅ OVERALL STATUS: ALL PERFORMANCE TARGETS MET")
+            self._out.append("✅ OVERALL STATUS: ALL PERFORMANCE TARGETS MET")
             return True
     
     def save_historical_data(self) -> None:
-        """Save benchmark results to historical data file"""
-        if not self.results:
+        """
+        Save benchmark results to historical data file
+        
+        Benchmarks whose mean exceeds their baseline are left out, so history
+        only describes acceptable runs and a sustained regression cannot become
+        the reference it is tested against.
+        """
+        if self.results is None:
             return
         
-        history_file = "performance_history.json"
-        history = []
-        
-        # Load existing history
-        if os.path.exists(history_file):
-            try:
-                with open(history_file, 'r') as f:
-                    history = json.load(f)
-            except Exception as e:
-                print(f"⚠️  Could not load performance history: {e}")
+        history_file = HISTORY_FILE
         
         # Add current results
         current_entry = {
@@ -224,59 +476,78 @@ class PerformanceRegressionChecker:
             'benchmarks': {}
         }
         
-        for benchmark in self.results.get('benchmarks', []):
-            name = benchmark.get('name', '').split('.')[-1]
-            stats = benchmark.get('stats', {})
-            
-            current_entry['benchmarks'][name] = {
-                'mean_ms': stats.get('mean', 0) * 1000,
-                'stddev_ms': stats.get('stddev', 0) * 1000,
-                'min_ms': stats.get('min', 0) * 1000,
-                'max_ms': stats.get('max', 0) * 1000,
-                'rounds': stats.get('rounds', 0)
+        for benchmark in self.benchmarks or []:
+            idx = _BASELINE_INDEX.get(benchmark.test_method)
+            if idx is not None and benchmark.mean > _BASELINE_MEANS_S[idx]:
+                continue
+            current_entry['benchmarks'][benchmark.test_method] = {
+                'mean_ms': benchmark.mean * 1000,
+                'stddev_ms': benchmark.stddev * 1000,
+                'min_ms': benchmark.min * 1000,
+                'max_ms': benchmark.max * 1000,
+                'rounds': benchmark.rounds
             }
         
-        history.append(current_entry)
-        
-        # Keep only last 50 entries
-        if len(history) > 50:
-            history = history[-50:]
-        
-        # Save updated history
+        # Append the current run as a single line
         try:
-            with open(history_file, 'w') as f:
-                json.dump(history, f, indent=2)
+            # json.dumps without indent goes through the C encoder; json.dump and
+            # indented output fall back to the pure-Python one
+            with open(history_file, 'a') as f:
+                f.write(json.dumps(current_entry) + "\n")
             print(f"📊 Performance data saved to {history_file}")
         except Exception as e:
             print(f"⚠️  Could not save performance history: {e}")
     
+    def _flush_output(self) -> None:
+        """Write buffered report lines to stdout in a single call"""
+        if self._out:
+            sys.stdout.write("\n".join(self._out) + "\n")
+            self._out.clear()
+    
     def run(self) -> bool:
         """Run complete performance regression check"""
-        print("🔍 PERFORMANCE REGRESSION CHECKER")
-        print("=" * 60)
-        print()
+        self._out.append("🔍 PERFORMANCE REGRESSION CHECKER")
+        self._out.append("=" * 60)
+        self._out.append("")
+        self._flush_output()
         
         if not self.load_results():
             return False
         
-        self.analyze_benchmarks()
+        self._migrate_legacy_history()
+        
+        try:
+            self.analyze_benchmarks()
+        except RegressionError as e:
+            # Fast-fail: the build is rejected anyway, skip the report and history
+            self._flush_output()
+            print(f"🚨 REGRESSION DETECTED (fast mode): {e}")
+            return False
+        
         success = self.generate_report()
+        self._flush_output()
         
-        # Save historical data for trend analysis
-        self.save_historical_data()
+        # Save historical data for trend analysis; failing runs are not recorded
+        if success:
+            self.save_historical_data()
         
         return success
 
 
 def main():
     """Main entry point"""
-    if len(sys.argv) != 2:
-        print("Usage: python check_performance_regression.py <benchmark_results.json>")
-        sys.exit(1)
-    
-    benchmark_file = sys.argv[1]
+    parser = argparse.ArgumentParser(
+        description="Check pytest-benchmark results for performance regressions"
+    )
+    parser.add_argument("benchmark_file", help="benchmark results JSON file")
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="stop at the first regression without writing performance history"
+    )
+    args = parser.parse_args()
     
-    checker = PerformanceRegressionChecker(benchmark_file)
+    checker = PerformanceRegressionChecker(args.benchmark_file, fast_fail=args.fast)
     success = checker.run()
     
     # Exit with error code if regressions found
@@ -7,9 +7,12 @@ retrieval, multi-tenancy, and vector search capabilities.
 """
 
 import asyncio
+import atexit
 import os
+import queue
 import sys
 import logging
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
 # Add src directory to Python path
@@ -19,16 +22,43 @@ sys.path.insert(0, str(src_path))
 from src.http_server import PersonalAssistantHTTPServer
 from src.http_config import Config
 
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+LEVELS = {name: getattr(logging, name) for name in ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")}
+
 def setup_logging():
     """Setup logging configuration"""
-    log_level = os.getenv("LOG_LEVEL", "INFO")
+    log_level = LEVELS.get(os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO)
+    
+    # File writes happen on a background listener thread so request handlers
+    # only pay for an enqueue, not a blocking disk write. Records are batched
+    # in memory (flushed early on errors) into a size-bounded rotating file
+    # that is not opened until the first flush.
+    file_handler = RotatingFileHandler(
+        "mcp_http_server.log",
+        maxBytes=10_000_000,
+        backupCount=5,
+        delay=True
+    )
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    memory_handler = MemoryHandler(1024, flushLevel=logging.ERROR, target=file_handler)
+    
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, memory_handler)
+    listener.start()
+    atexit.register(listener.stop)
+    
+    # The file handler applies LOG_FORMAT on the listener side; the queue
+    # handler only merges the message arguments
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
     
     logging.basicConfig(
-        level=getattr(logging, log_level),
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        level=log_level,
+        format=LOG_FORMAT,
         handlers=[
             logging.StreamHandler(sys.stdout),
-            logging.FileHandler("mcp_http_server.log")
+            queue_handler
         ]
     )
 
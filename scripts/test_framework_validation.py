@@ -4,12 +4,97 @@ Test Framework Validation Report
 Validates all components of the comprehensive test suite
 """
 
+import ast
 import sys
 import os
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
+# Per-file test counts and import flags keyed by path, invalidated by modification time
+TEST_COUNT_CACHE = ".test_count.cache"
+
+# File reads are I/O-bound, so they are overlapped across a small thread pool
+MAX_WORKERS = 8
+
+def load_test_count_cache():
+    """Load cached test counts from the sidecar file"""
+    try:
+        with open(TEST_COUNT_CACHE, 'r') as f:
+            cache = json.load(f)
+    except Exception:
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+def save_test_count_cache(cache):
+    """Persist cached test counts to the sidecar file"""
+    try:
+        with open(TEST_COUNT_CACHE, 'w') as f:
+            json.dump(cache, f)
+    except Exception as e:
+        print(f"⚠️  Could not save test count cache: {e}")
+
+def summarize_test_file(file_path, cache):
+    """Return (test_count, has_imports) for a file, reading it only when it changed"""
+    path = Path(file_path)
+    key = str(path)
+    mtime_ns = path.stat().st_mtime_ns
+    
+    # Entries round-trip through JSON as [mtime_ns, count, has_imports] lists
+    cached = cache.get(key)
+    if isinstance(cached, list) and len(cached) == 3 and cached[0] == mtime_ns:
+        return cached[1], cached[2]
+    
+    content = path.read_text()
+    tree = ast.parse(content, filename=key)
+    count = sum(
+        isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name.startswith("test_")
+        for node in ast.walk(tree)
+    )
+    has_imports = "import" in content
+    cache[key] = [mtime_ns, count, has_imports]
+    return count, has_imports
+
+def read_file(file_path):
+    """Read a file, returning (content, error)"""
+    try:
+        with open(file_path, 'r') as f:
+            return f.read(), None
+    except Exception as e:
+        return None, e
+
+def inspect_test_file(file_path, cache):
+    """Summarize a test file, returning (path, test_count, has_imports, error)"""
+    try:
+        return (file_path, *summarize_test_file(file_path, cache), None)
+    except Exception as e:
+        return file_path, 0, False, e
+
+def inspect_test_files(file_paths, cache):
+    """Inspect test files concurrently, preserving input order"""
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        return list(executor.map(lambda path: inspect_test_file(path, cache), file_paths))
+
+def scan_directories(directories):
+    """List each directory once, returning the sets of file and directory paths found"""
+    files = set()
+    dirs = set()
+    
+    for directory in directories:
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    path = os.path.normpath(os.path.join(directory, entry.name))
+                    if entry.is_dir():
+                        dirs.add(path)
+                    else:
+                        files.add(path)
+        except OSError:
+            continue
+    
+    return files, dirs
+
 def validate_test_structure():
     """Validate test directory structure"""
     print("🏗️  Validating Test Structure...")
@@ -36,18 +121,15 @@ def validate_test_structure():
         "scripts/check_performance_regression.py"
     ]
     
-    missing_dirs = []
-    missing_files = []
-    
-    # Check directories
-    for dir_path in required_dirs:
-        if not os.path.exists(dir_path):
-            missing_dirs.append(dir_path)
+    # Read each parent directory once instead of stat()ing every path
+    parents = {
+        os.path.dirname(os.path.normpath(path)) or "."
+        for path in required_dirs + required_files
+    }
+    present_files, present_dirs = scan_directories(sorted(parents))
     
-    # Check files
-    for file_path in required_files:
-        if not os.path.exists(file_path):
-            missing_files.append(file_path)
+    missing_dirs = [d for d in required_dirs if os.path.normpath(d) not in present_dirs]
+    missing_files = [f for f in required_files if os.path.normpath(f) not in present_files]
     
     if missing_dirs:
         print(f"❌ Missing directories: {missing_dirs}")
@@ -71,26 +153,26 @@ def validate_test_content():
         "tests/performance/test_performance.py"
     ]
     
-    for test_file in test_files:
-        try:
-            with open(test_file, 'r') as f:
-                content = f.read()
-                
-            # Basic validation - should contain test functions
-            if "def test_" not in content:
-                print(f"❌ {test_file} contains no test functions")
-                return False
-                
-            # Should contain imports
-            if "import" not in content:
-                print(f"❌ {test_file} contains no imports")
-                return False
-                
-            print(f"✅ {test_file} content validated")
+    cache = load_test_count_cache()
+    results = inspect_test_files(test_files, cache)
+    save_test_count_cache(cache)
+    
+    for test_file, test_count, has_imports, error in results:
+        if error is not None:
+            print(f"❌ Error reading {test_file}: {error}")
+            return False
             
-        except Exception as e:
-            print(f"❌ Error reading {test_file}: {e}")
+        # Basic validation - should contain test functions
+        if test_count == 0:
+            print(f"❌ {test_file} contains no test functions")
             return False
+            
+        # Should contain imports
+        if not has_imports:
+            print(f"❌ {test_file} contains no imports")
+            return False
+            
+        print(f"✅ {test_file} content validated")
     
     return True
 
@@ -130,10 +212,15 @@ def validate_scripts():
     """Validate test execution scripts"""
     print("📜 Validating Test Scripts...")
     
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        (script_content, script_error), (checker_content, checker_error) = executor.map(
+            read_file, ["scripts/run_tests.sh", "scripts/check_performance_regression.py"]
+        )
+    
     # Check run_tests.sh
     try:
-        with open("scripts/run_tests.sh", 'r') as f:
-            script_content = f.read()
+        if script_error is not None:
+            raise script_error
         
         required_features = [
             "usage()", "build_pytest_cmd", "run_unit_tests", 
@@ -158,8 +245,8 @@ def validate_scripts():
     
     # Check performance regression checker
     try:
-        with open("scripts/check_performance_regression.py", 'r') as f:
-            checker_content = f.read()
+        if checker_error is not None:
+            raise checker_error
         
         if "PerformanceRegressionChecker" not in checker_content:
             print("❌ Performance regression checker missing main class")
@@ -181,31 +268,36 @@ def count_test_methods():
     total_tests = 0
     
     test_dirs = ["tests/unit/", "tests/integration/", "tests/performance/"]
+    cache = load_test_count_cache()
     
-    for test_dir in test_dirs:
-        if not os.path.exists(test_dir):
-            continue
-            
+    dir_files = {
+        test_dir: list(Path(test_dir).glob("test_*.py"))
+        for test_dir in test_dirs
+        if os.path.exists(test_dir)
+    }
+    results = iter(inspect_test_files(
+        [file_path for files in dir_files.values() for file_path in files], cache
+    ))
+    
+    for test_dir, files in dir_files.items():
         dir_count = 0
         
-        for file_path in Path(test_dir).glob("test_*.py"):
-            try:
-                with open(file_path, 'r') as f:
-                    content = f.read()
-                
-                # Count test functions
-                file_tests = content.count("def test_")
-                dir_count += file_tests
-                
-                print(f"  {file_path.name}: {file_tests} test methods")
-                
-            except Exception as e:
-                print(f"❌ Error counting tests in {file_path}: {e}")
+        for _ in files:
+            file_path, file_tests, _, error = next(results)
+            if error is not None:
+                print(f"❌ Error counting tests in {file_path}: {error}")
+                continue
+            
+            # Count test functions
+            dir_count += file_tests
+            
+            print(f"  {file_path.name}: {file_tests} test methods")
         
         test_counts[test_dir] = dir_count
         total_tests += dir_count
         print(f"  {test_dir} total: {dir_count} tests")
     
+    save_test_count_cache(cache)
     print(f"\n📊 Total Test Methods: {total_tests}")
     return total_tests, test_counts
 
@@ -9,30 +9,54 @@ Supports multiple client authentication methods as required by OAuth 2.1:
 """
 
 import base64
+import copy
+import dataclasses
+import functools
+import hashlib
 import json
 import logging
-from dataclasses import dataclass
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
-from typing import Dict, Any, Optional, Literal
+from typing import Callable, Dict, Any, Optional, Literal
 import jwt
-from cryptography.x509 import Certificate, load_pem_x509_certificate
+from cryptography.x509 import (
+    Certificate, DNSName, ExtensionNotFound, SubjectAlternativeName, load_pem_x509_certificate
+)
+from cryptography.x509.oid import NameOID
 from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.serialization import load_pem_public_key
 from cryptography.hazmat.primitives.asymmetric import rsa, padding
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Successful authentications are reused for identical credentials
+AUTH_CACHE_TTL = 60  # seconds
+AUTH_CACHE_MAXSIZE = 4096
+
+# Registry fields holding a client's credentials; a cached authentication is
+# only reused while these are unchanged
+_REGISTERED_CREDENTIAL_FIELDS = ("client_secret", "public_key", "jwks_uri", "alg")
+
+# Credential fields that identify a presented credential, per auth method
+_CREDENTIAL_FIELDS = {
+    "private_key_jwt": ("client_assertion", "client_assertion_type"),
+    "tls_client_auth": ("client_certificate",),
+    "client_secret_basic": ("authorization_header",),
+    "client_secret_post": ("client_id", "client_secret"),
+}
+
+@dataclass(slots=True, frozen=True)
 class ClientContext:
     """Client authentication context"""
     client_id: str
     client_type: Literal["confidential", "public"]
     auth_method: str
     authenticated: bool
-    metadata: Dict[str, Any]
-    
-    def __post_init__(self):
-        if self.metadata is None:
-            self.metadata = {}
+    metadata: Dict[str, Any] = field(default_factory=dict)
 
 class ClientAuthenticationError(Exception):
     """Client authentication errors"""
@@ -62,6 +86,39 @@ class ClientAuthenticator:
         self.jwt_audience = jwt_audience
         self.max_jwt_age = max_jwt_age
         
+        # Assertion decoder with the instance-wide arguments bound once
+        self._decode_assertion = functools.partial(
+            jwt.decode,
+            audience=jwt_audience,
+            options={
+                "require": ["exp", "iat", "iss", "sub", "aud"],
+                "verify_exp": True,
+                "verify_iat": True,
+            }
+        )
+        
+        # client_id -> (configured key source, alg, specialized verifier)
+        self._verifier_cache: Dict[str, Any] = {}
+        
+        # client_id -> (configured secret, UTF-8 encoded secret)
+        self._secret_cache: Dict[str, Any] = {}
+        for client_id, client_config in client_registry.items():
+            secret = client_config.get("client_secret")
+            if secret:
+                self._secret_cache[client_id] = (secret, secret.encode("utf-8"))
+        
+        self._method_handlers = {
+            "private_key_jwt": self._authenticate_private_key_jwt,
+            "tls_client_auth": self._authenticate_tls_client_auth,
+            "client_secret_basic": self._authenticate_client_secret_basic,
+            "client_secret_post": self._authenticate_client_secret_post,
+        }
+        
+        # (auth_method, credential digest) ->
+        #     (monotonic expiry, ClientContext, registered credential fingerprint)
+        self._auth_cache: OrderedDict = OrderedDict()
+        self._auth_cache_lock = threading.Lock()
+        
     def authenticate_client(self, 
                           auth_method: str,
                           credentials: Dict[str, Any]) -> ClientContext:
@@ -78,24 +135,86 @@ class ClientAuthenticator:
         Raises:
             ClientAuthenticationError: If authentication fails
         """
-        method_handlers = {
-            "private_key_jwt": self._authenticate_private_key_jwt,
-            "tls_client_auth": self._authenticate_tls_client_auth,
-            "client_secret_basic": self._authenticate_client_secret_basic,
-            "client_secret_post": self._authenticate_client_secret_post,
-        }
-        
-        handler = method_handlers.get(auth_method)
+        handler = self._method_handlers.get(auth_method)
         if not handler:
             raise ClientAuthenticationError(
                 f"Unsupported authentication method: {auth_method}"
             )
         
+        cache_key = self._credential_cache_key(auth_method, credentials)
+        if cache_key:
+            cached = self._get_cached_context(cache_key)
+            if cached:
+                return cached
+        
         try:
-            return handler(credentials)
+            client_context = handler(credentials)
         except Exception as e:
             logger.error(f"Client authentication failed for method {auth_method}: {e}")
             raise ClientAuthenticationError(f"Authentication failed: {e}")
+        
+        if cache_key:
+            self._cache_context(cache_key, client_context)
+        return client_context
+    
+    def _credential_cache_key(self, auth_method: str, credentials: Dict[str, Any]) -> Optional[tuple]:
+        """Build the auth cache key from a digest of the presented credentials"""
+        digest = hashlib.blake2b(digest_size=16)
+        for name in _CREDENTIAL_FIELDS[auth_method]:
+            value = credentials.get(name)
+            if not isinstance(value, str):
+                return None
+            encoded = value.encode("utf-8")
+            digest.update(len(encoded).to_bytes(4, "big"))
+            digest.update(encoded)
+        return (auth_method, digest.digest())
+    
+    def _registered_fingerprint(self, client_id: str) -> Optional[tuple]:
+        """Snapshot the client's registered credentials, or None if it is not registered"""
+        client_config = self.client_registry.get(client_id)
+        if client_config is None:
+            return None
+        return tuple(client_config.get(name) for name in _REGISTERED_CREDENTIAL_FIELDS)
+    
+    def _get_cached_context(self, cache_key: tuple) -> Optional[ClientContext]:
+        """Return a cached ClientContext with a fresh auth_time, if still valid"""
+        with self._auth_cache_lock:
+            entry = self._auth_cache.get(cache_key)
+            if entry is None:
+                return None
+            # Deleted clients and rotated secrets or keys invalidate the entry
+            if entry[0] <= time.monotonic() or entry[2] != self._registered_fingerprint(entry[1].client_id):
+                del self._auth_cache[cache_key]
+                return None
+            self._auth_cache.move_to_end(cache_key)
+        
+        client_context = entry[1]
+        logger.debug(f"Client authentication cache hit: {client_context.client_id}")
+        metadata = copy.deepcopy(client_context.metadata)
+        metadata["auth_time"] = datetime.now(timezone.utc).isoformat()
+        return dataclasses.replace(client_context, metadata=metadata)
+    
+    def _cache_context(self, cache_key: tuple, client_context: ClientContext) -> None:
+        """Cache a successful authentication, bounded by the assertion's own lifetime"""
+        ttl = AUTH_CACHE_TTL
+        jwt_payload = client_context.metadata.get("jwt_payload")
+        if jwt_payload:
+            now = time.time()
+            ttl = min(ttl, jwt_payload["exp"] - now, jwt_payload["iat"] + self.max_jwt_age - now)
+            if ttl <= 0:
+                return
+        
+        fingerprint = self._registered_fingerprint(client_context.client_id)
+        if fingerprint is None:
+            return
+        
+        # The caller keeps the original; the cache holds its own metadata
+        cached_context = dataclasses.replace(client_context, metadata=copy.deepcopy(client_context.metadata))
+        with self._auth_cache_lock:
+            self._auth_cache[cache_key] = (time.monotonic() + ttl, cached_context, fingerprint)
+            self._auth_cache.move_to_end(cache_key)
+            if len(self._auth_cache) > AUTH_CACHE_MAXSIZE:
+                self._auth_cache.popitem(last=False)
     
     def _authenticate_private_key_jwt(self, credentials: Dict[str, Any]) -> ClientContext:
         """
@@ -116,11 +235,17 @@ class ClientAuthenticator:
         if assertion_type != expected_type:
             raise ClientAuthenticationError(f"Invalid assertion type: {assertion_type}")
         
-        # Decode JWT header to get client_id
+        # Read client_id from the payload without a throwaway decode pass
+        try:
+            _, payload_b64, _ = assertion.split(".", 2)
+            unverified_payload = json.loads(base64.urlsafe_b64decode(payload_b64 + "==="))
+        except ValueError:
+            raise ClientAuthenticationError("Malformed JWT assertion")
+        
+        if not isinstance(unverified_payload, dict):
+            raise ClientAuthenticationError("Malformed JWT assertion")
+        
         try:
-            unverified_header = jwt.get_unverified_header(assertion)
-            unverified_payload = jwt.decode(assertion, options={"verify_signature": False})
-            
             client_id = unverified_payload.get("iss") or unverified_payload.get("sub")
             if not client_id:
                 raise ClientAuthenticationError("Missing client_id in JWT")
@@ -130,21 +255,9 @@ class ClientAuthenticator:
             if not client_config:
                 raise ClientAuthenticationError(f"Unknown client: {client_id}")
             
-            # Get public key for verification
-            public_key = self._get_client_public_key(client_config)
-            
-            # Verify JWT
-            payload = jwt.decode(
-                assertion,
-                public_key,
-                algorithms=["RS256", "ES256"],
-                audience=self.jwt_audience,
-                options={
-                    "require": ["exp", "iat", "iss", "sub", "aud"],
-                    "verify_exp": True,
-                    "verify_iat": True,
-                }
-            )
+            # Verify JWT with the client's key and pinned algorithm
+            verify = self._get_client_verifier(client_id, client_config)
+            payload = verify(assertion)
             
             # Validate JWT claims
             self._validate_jwt_claims(payload, client_id)
@@ -220,26 +333,26 @@ class ClientAuthenticator:
             Authenticated ClientContext
         """
         auth_header = credentials.get("authorization_header")
-        if not auth_header or not auth_header.startswith("Basic "):
+        if not auth_header or len(auth_header) < 8 or not auth_header.startswith("Basic "):
             raise ClientAuthenticationError("Missing or invalid Basic auth header")
         
         try:
-            # Decode Basic auth credentials
-            encoded_creds = auth_header[6:]  # Remove "Basic "
-            decoded_creds = base64.b64decode(encoded_creds).decode("utf-8")
-            client_id, client_secret = decoded_creds.split(":", 1)
+            # Decode Basic auth credentials, splitting before any text decoding
+            raw_creds = base64.b64decode(auth_header[6:], validate=True)  # Remove "Basic "
+            sep = raw_creds.find(b":")
+            if sep < 0:
+                raise ClientAuthenticationError("Invalid Basic auth format: missing ':' separator")
+            client_id = raw_creds[:sep].decode("utf-8")
+            client_secret = raw_creds[sep + 1:]
             
             # Verify client credentials
             client_config = self.client_registry.get(client_id)
             if not client_config:
                 raise ClientAuthenticationError(f"Unknown client: {client_id}")
             
-            expected_secret = client_config.get("client_secret")
-            if not expected_secret:
-                raise ClientAuthenticationError("Client not configured for secret authentication")
+            expected_secret = self._get_client_secret_bytes(client_id, client_config)
             
             # Constant-time comparison
-            import secrets
             if not secrets.compare_digest(client_secret, expected_secret):
                 raise ClientAuthenticationError("Invalid client credentials")
             
@@ -278,13 +391,10 @@ class ClientAuthenticator:
         if not client_config:
             raise ClientAuthenticationError(f"Unknown client: {client_id}")
         
-        expected_secret = client_config.get("client_secret")
-        if not expected_secret:
-            raise ClientAuthenticationError("Client not configured for secret authentication")
+        expected_secret = self._get_client_secret_bytes(client_id, client_config)
         
         # Constant-time comparison
-        import secrets
-        if not secrets.compare_digest(client_secret, expected_secret):
+        if not secrets.compare_digest(client_secret.encode("utf-8"), expected_secret):
             raise ClientAuthenticationError("Invalid client credentials")
         
         logger.info(f"Client authenticated via client_secret_post: {client_id}")
@@ -298,16 +408,44 @@ class ClientAuthenticator:
             }
         )
     
-    def _get_client_public_key(self, client_config: Dict[str, Any]) -> str:
-        """Get public key for JWT verification from client config"""
-        public_key = client_config.get("public_key") or client_config.get("jwks_uri")
-        if not public_key:
+    def _get_client_secret_bytes(self, client_id: str, client_config: Dict[str, Any]) -> bytes:
+        """Get the client's secret as bytes, cached per client"""
+        secret = client_config.get("client_secret")
+        if not secret:
+            raise ClientAuthenticationError("Client not configured for secret authentication")
+        
+        cached = self._secret_cache.get(client_id)
+        if cached is None or cached[0] != secret:
+            cached = (secret, secret.encode("utf-8"))
+            self._secret_cache[client_id] = cached
+        return cached[1]
+    
+    def _get_client_verifier(self,
+                             client_id: str,
+                             client_config: Dict[str, Any]) -> Callable[[str], Dict[str, Any]]:
+        """Get a JWT verifier bound to the client's parsed key and algorithm, cached per client"""
+        source = client_config.get("public_key") or client_config.get("jwks_uri")
+        if not source:
             raise ClientAuthenticationError("No public key configured for client")
-        return public_key
+        alg = client_config.get("alg", "RS256")
+        
+        cached = self._verifier_cache.get(client_id)
+        if cached is None or cached[0] != source or cached[1] != alg:
+            decode = functools.partial(self._decode_assertion, algorithms=[alg])
+            if client_config.get("public_key"):
+                verify = functools.partial(decode, key=load_pem_public_key(source.encode()))
+            else:
+                jwks_client = jwt.PyJWKClient(source)
+                
+                def verify(token: str) -> Dict[str, Any]:
+                    return decode(token, key=jwks_client.get_signing_key_from_jwt(token).key)
+            cached = (source, alg, verify)
+            self._verifier_cache[client_id] = cached
+        return cached[2]
     
     def _validate_jwt_claims(self, payload: Dict[str, Any], client_id: str) -> None:
         """Validate JWT assertion claims"""
-        now = datetime.now(timezone.utc)
+        now = time.time()
         
         # Check issuer and subject
         if payload.get("iss") != client_id:
@@ -318,12 +456,12 @@ class ClientAuthenticator:
         
         # Check expiration (additional check beyond JWT library)
         exp = payload.get("exp")
-        if exp and datetime.fromtimestamp(exp, timezone.utc) < now:
+        if exp and exp < now:
             raise ClientAuthenticationError("JWT has expired")
         
         # Check issued at time
         iat = payload.get("iat")
-        if iat and (now - datetime.fromtimestamp(iat, timezone.utc)).total_seconds() > self.max_jwt_age:
+        if iat and now - iat > self.max_jwt_age:
             raise ClientAuthenticationError("JWT is too old")
         
         logger.debug("JWT claims validation passed")
@@ -331,21 +469,30 @@ class ClientAuthenticator:
     def _extract_client_id_from_cert(self, certificate: Certificate) -> str:
         """Extract client ID from certificate"""
         # Try Common Name first
-        for attribute in certificate.subject:
-            if attribute.oid._name == "commonName":
-                return attribute.value
+        common_names = certificate.subject.get_attributes_for_oid(NameOID.COMMON_NAME)
+        if common_names:
+            return common_names[0].value
+        
+        # Fall back to the first DNS Subject Alternative Name
+        try:
+            san = certificate.extensions.get_extension_for_class(SubjectAlternativeName)
+        except ExtensionNotFound:
+            san = None
+        if san:
+            dns_names = san.value.get_values_for_type(DNSName)
+            if dns_names:
+                return dns_names[0]
         
-        # Could also check Subject Alternative Names
         raise ClientAuthenticationError("Cannot extract client_id from certificate")
     
     def _verify_client_certificate(self, certificate: Certificate, client_config: Dict[str, Any]) -> None:
         """Verify client certificate is valid and trusted"""
         # Check certificate is not expired
-        now = datetime.now(timezone.utc)
-        if certificate.not_valid_after < now:
+        now = time.time()
+        if certificate.not_valid_after_utc.timestamp() < now:
             raise ClientAuthenticationError("Client certificate has expired")
         
-        if certificate.not_valid_before > now:
+        if certificate.not_valid_before_utc.timestamp() > now:
             raise ClientAuthenticationError("Client certificate not yet valid")
         
         # Additional certificate validation could be added here
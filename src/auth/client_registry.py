@@ -8,30 +8,49 @@ Implements OAuth 2.1 dynamic client registration with MCP-specific extensions:
 - Client configuration updates
 """
 
-import json
+import hashlib
+import hmac
 import logging
-import secrets
-from datetime import datetime, timezone, timedelta
-from typing import Dict, Any, Optional, List, Literal
+import re
+import threading
+import time
+from base64 import urlsafe_b64encode as _b64encode
+from collections import OrderedDict
+from contextlib import contextmanager
+from os import urandom as _urandom
+from datetime import datetime, timezone
+from typing import Annotated, Dict, Any, Optional, List, Literal, Sequence, Set, Tuple, TypedDict
 from dataclasses import dataclass, asdict
-from urllib.parse import urlparse
-import uuid
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints, ValidationError
+
+# Optional native validator (rust/mcp_pa_dcr); the Python fast path is used without it
+try:
+    from mcp_pa_dcr import RegistrationError as _NativeRegistrationError
+    from mcp_pa_dcr import validate_registration as _native_validate_registration
+except ImportError:
+    _native_validate_registration = None
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Shared immutable defaults; list attributes are replaced wholesale, never mutated
+_NO_VALUES = ()
+_DEFAULT_CLIENT_GRANT_TYPES = ("authorization_code", "refresh_token")
+_CODE_RESPONSE_TYPES = ("code",)
+_DEFAULT_MCP_CAPABILITIES = ("resources", "tools", "prompts")
+
+@dataclass(slots=True)
 class ClientRegistration:
     """Client registration data structure"""
     client_id: str
     client_secret: Optional[str] = None
     client_name: str = ""
     client_uri: Optional[str] = None
-    redirect_uris: List[str] = None
-    grant_types: List[str] = None
-    response_types: List[str] = None
+    redirect_uris: Sequence[str] = None
+    grant_types: Sequence[str] = None
+    response_types: Sequence[str] = None
     scope: Optional[str] = None
     token_endpoint_auth_method: str = "client_secret_basic"
-    contacts: List[str] = None
+    contacts: Sequence[str] = None
     logo_uri: Optional[str] = None
     policy_uri: Optional[str] = None
     tos_uri: Optional[str] = None
@@ -43,7 +62,7 @@ class ClientRegistration:
     
     # MCP specific extensions
     mcp_version: str = "2024-11-05"
-    mcp_capabilities: List[str] = None
+    mcp_capabilities: Sequence[str] = None
     
     # Registration metadata
     client_id_issued_at: int = 0
@@ -53,15 +72,115 @@ class ClientRegistration:
     
     def __post_init__(self):
         if self.redirect_uris is None:
-            self.redirect_uris = []
+            self.redirect_uris = _NO_VALUES
         if self.grant_types is None:
-            self.grant_types = ["authorization_code", "refresh_token"]
+            self.grant_types = _DEFAULT_CLIENT_GRANT_TYPES
         if self.response_types is None:
-            self.response_types = ["code"]
+            self.response_types = _CODE_RESPONSE_TYPES
         if self.contacts is None:
-            self.contacts = []
+            self.contacts = _NO_VALUES
         if self.mcp_capabilities is None:
-            self.mcp_capabilities = ["resources", "tools", "prompts"]
+            self.mcp_capabilities = _DEFAULT_MCP_CAPABILITIES
+
+# Upper bounds on list metadata, so one request can't force unbounded work
+MAX_REDIRECT_URIS = 10
+MAX_REDIRECT_URI_LENGTH = 2048
+MAX_CONTACTS = 32
+MAX_MCP_CAPABILITIES = 32
+
+# Registration attributes echoed in responses only when set
+_OPTIONAL_RESPONSE_FIELDS = (
+    "client_uri", "logo_uri", "policy_uri", "tos_uri",
+    "contacts", "software_id", "software_version"
+)
+
+# OAuth 2.1 allows only these grants and client authentication methods
+_GRANT_TYPES = ("authorization_code", "refresh_token")
+_AUTH_METHODS = (
+    "client_secret_basic",
+    "client_secret_post",
+    "private_key_jwt",
+    "tls_client_auth",
+    "none"
+)
+_SECRET_AUTH_METHODS = frozenset({"client_secret_basic", "client_secret_post"})
+_LOOPBACK_HOSTS = frozenset({"localhost", "127.0.0.1", "[::1]"})
+
+# Prefixes of redirect URIs that are valid without further parsing. Loopback
+# URIs with a port go through _REDIRECT_URI_RE: after "host:" the authority
+# may still hold userinfo ("http://localhost:@evil.com/") naming another host
+_LOOPBACK_PREFIXES = ("http://localhost/", "http://127.0.0.1/", "http://[::1]/")
+_NO_HOST_MARKERS = frozenset({"", "/", "?", ":"})
+
+# Redirect URIs must be absolute http(s) URIs; captures scheme and host
+_REDIRECT_URI_RE = re.compile(
+    r"^(?P<scheme>https?)://(?P<host>\[[0-9a-f:.]+\]|[^:/?#\[\]]+)(?::\d+)?(?:[/?#]|$)",
+    re.IGNORECASE
+)
+
+class _RegistrationRequest(BaseModel):
+    """Registration request schema (RFC 7591 + MCP), compiled once by pydantic-core"""
+    model_config = ConfigDict(strict=True)
+    
+    redirect_uris: Optional[List[Annotated[str, StringConstraints(max_length=MAX_REDIRECT_URI_LENGTH)]]] = Field(
+        default=None, max_length=MAX_REDIRECT_URIS
+    )
+    grant_types: List[Literal[_GRANT_TYPES]] = ["authorization_code"]
+    response_types: List[Literal["code"]] = Field(default=["code"], min_length=1, max_length=1)
+    token_endpoint_auth_method: Literal[_AUTH_METHODS] = "client_secret_basic"
+    client_name: Optional[str] = None
+    client_uri: Optional[str] = None
+    scope: Optional[str] = None
+    logo_uri: Optional[str] = None
+    policy_uri: Optional[str] = None
+    tos_uri: Optional[str] = None
+    software_id: Optional[str] = None
+    software_version: Optional[str] = None
+    contacts: Optional[List[str]] = Field(default=None, max_length=MAX_CONTACTS)
+    mcp_version: Any = "2024-11-05"
+    mcp_capabilities: List[Any] = Field(
+        default=["resources", "tools", "prompts"], max_length=MAX_MCP_CAPABILITIES
+    )
+
+# Request shape handled by the registration fast path
+_STRING_FIELDS = (
+    "client_name", "client_uri", "scope", "logo_uri",
+    "policy_uri", "tos_uri", "software_id", "software_version"
+)
+_FAST_PATH_FIELDS = frozenset({
+    "redirect_uris", "grant_types", "response_types", "token_endpoint_auth_method", *_STRING_FIELDS
+})
+_DEFAULT_GRANT_TYPES = ["authorization_code"]
+_DEFAULT_RESPONSE_TYPES = ["code"]
+
+# Fields always present in validated data; the rest only when non-empty
+_ALWAYS_VALIDATED_FIELDS = frozenset({
+    "grant_types", "response_types", "token_endpoint_auth_method", "mcp_version", "mcp_capabilities"
+})
+
+class ClientRegistrationResponse(TypedDict, total=False):
+    """Client registration response (RFC 7591 section 3.2.1); JSON-ready as built"""
+    client_id: str
+    client_name: str
+    redirect_uris: Sequence[str]
+    grant_types: Sequence[str]
+    response_types: Sequence[str]
+    token_endpoint_auth_method: str
+    scope: Optional[str]
+    client_id_issued_at: int
+    client_uri: str
+    logo_uri: str
+    policy_uri: str
+    tos_uri: str
+    contacts: Sequence[str]
+    software_id: str
+    software_version: str
+    mcp_version: str
+    mcp_capabilities: Sequence[str]
+    client_secret: str
+    client_secret_expires_at: int
+    registration_access_token: str
+    registration_client_uri: str
 
 class ClientRegistrationError(Exception):
     """Client registration specific errors"""
@@ -70,6 +189,28 @@ class ClientRegistrationError(Exception):
         self.description = description
         super().__init__(f"{error}: {description}")
 
+class _InMemoryClientStore:
+    """Dict-backed client/token store; transaction() is the seam for a database backend"""
+    
+    def __init__(self):
+        self.clients: Dict[str, ClientRegistration] = {}
+        # Keyed by SHA-256 of the token so live tokens are never held as keys
+        # token hash -> (client_id, expires_at epoch seconds)
+        self.tokens: Dict[bytes, Tuple[str, int]] = {}
+        self.client_tokens: Dict[str, Set[bytes]] = {}
+    
+    @contextmanager
+    def transaction(self):
+        """Group writes; a database store commits them in one round trip"""
+        yield self
+    
+    def upsert_client(self, registration: ClientRegistration) -> None:
+        self.clients[registration.client_id] = registration
+    
+    def upsert_token(self, token_hash: bytes, client_id: str, expires_at: int) -> None:
+        self.tokens[token_hash] = (client_id, expires_at)
+        self.client_tokens.setdefault(client_id, set()).add(token_hash)
+
 class DynamicClientRegistry:
     """
     RFC 7591 compliant dynamic client registration
@@ -101,12 +242,36 @@ class DynamicClientRegistry:
         self.registration_token_expiry = registration_token_expiry
         
         # Client storage (use database in production)
-        self.registered_clients: Dict[str, ClientRegistration] = {}
-        self.registration_tokens: Dict[str, Dict[str, Any]] = {}
+        self._store = _InMemoryClientStore()
+        self.registered_clients = self._store.clients
+        self.registration_tokens = self._store.tokens
+        self._client_tokens = self._store.client_tokens
+        
+        # Expired registration tokens are swept every _sweep_every token writes
+        self._writes_since_sweep = 0
+        self._sweep_every = 1000
+        
+        # Per-client locks serialize update/delete; readers stay lock-free
+        self._locks: Dict[str, threading.Lock] = {}
+        
+        # list_clients summary kept column-wise; client_id -> row position
+        self._summary_lock = threading.Lock()
+        self._summary_pos: Dict[str, int] = {}
+        self._sum_ids: List[str] = []
+        self._sum_names: List[str] = []
+        self._sum_issued: List[int] = []
+        self._sum_scopes: List[Optional[str]] = []
+        self._sum_grants: List[tuple] = []
+        
+        # client_id -> (monotonic expiry, registration), fronting the client store
+        self._client_cache: OrderedDict = OrderedDict()
+        self._client_cache_lock = threading.Lock()
+        self._client_cache_ttl = 60
+        self._client_cache_max = 4096
         
         logger.info(f"DynamicClientRegistry initialized for issuer: {issuer}")
     
-    def register_client(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
+    def register_client(self, request_data: Dict[str, Any]) -> ClientRegistrationResponse:
         """
         Register new OAuth 2.1 client (RFC 7591)
         
@@ -119,6 +284,9 @@ class DynamicClientRegistry:
         Raises:
             ClientRegistrationError: If registration fails
         """
+        now = datetime.now(timezone.utc)
+        now_timestamp = int(now.timestamp())
+        
         try:
             # Validate registration request
             validated_data = self._validate_registration_request(request_data)
@@ -129,36 +297,18 @@ class DynamicClientRegistry:
             client_secret_expires_at = 0
             
             # Determine if client needs secret
-            auth_method = validated_data.get("token_endpoint_auth_method", "client_secret_basic")
-            if auth_method in ["client_secret_basic", "client_secret_post"]:
+            if validated_data["token_endpoint_auth_method"] in _SECRET_AUTH_METHODS:
                 client_secret = self._generate_client_secret()
-                client_secret_expires_at = int(
-                    (datetime.now(timezone.utc) + timedelta(seconds=self.client_secret_expiry)).timestamp()
-                )
-            
-            # Create registration
-            now_timestamp = int(datetime.now(timezone.utc).timestamp())
+                client_secret_expires_at = now_timestamp + self.client_secret_expiry
             
+            # Create registration straight from the validated fields
+            validated_data.setdefault("scope", self.default_scope)
             client_registration = ClientRegistration(
                 client_id=client_id,
                 client_secret=client_secret,
-                client_name=validated_data.get("client_name", ""),
-                client_uri=validated_data.get("client_uri"),
-                redirect_uris=validated_data["redirect_uris"],
-                grant_types=validated_data.get("grant_types", ["authorization_code"]),
-                response_types=validated_data.get("response_types", ["code"]),
-                scope=validated_data.get("scope", self.default_scope),
-                token_endpoint_auth_method=auth_method,
-                contacts=validated_data.get("contacts", []),
-                logo_uri=validated_data.get("logo_uri"),
-                policy_uri=validated_data.get("policy_uri"),
-                tos_uri=validated_data.get("tos_uri"),
-                software_id=validated_data.get("software_id"),
-                software_version=validated_data.get("software_version"),
-                mcp_version=validated_data.get("mcp_version", "2024-11-05"),
-                mcp_capabilities=validated_data.get("mcp_capabilities", ["resources", "tools", "prompts"]),
                 client_id_issued_at=now_timestamp,
-                client_secret_expires_at=client_secret_expires_at
+                client_secret_expires_at=client_secret_expires_at,
+                **validated_data
             )
             
             # Generate registration access token
@@ -166,9 +316,8 @@ class DynamicClientRegistry:
             client_registration.registration_access_token = registration_token
             client_registration.registration_client_uri = f"{self.issuer}/oauth/register/{client_id}"
             
-            # Store registration
-            self.registered_clients[client_id] = client_registration
-            self._store_registration_token(registration_token, client_id)
+            # Store registration and its access token together
+            self._persist_registration(client_registration, registration_token)
             
             # Build response
             response = self._build_registration_response(client_registration)
@@ -192,12 +341,28 @@ class DynamicClientRegistry:
         Returns:
             ClientRegistration if found, None otherwise
         """
-        return self.registered_clients.get(client_id)
+        now = time.monotonic()
+        with self._client_cache_lock:
+            cached = self._client_cache.get(client_id)
+            if cached:
+                if cached[0] > now:
+                    self._client_cache.move_to_end(client_id)
+                    return cached[1]
+                del self._client_cache[client_id]
+            
+            # The store is read under the cache lock, and deletes evict under
+            # it after removing the client, so a deleted client is never re-cached
+            registration = self.registered_clients.get(client_id)
+            if registration:
+                self._client_cache[client_id] = (now + self._client_cache_ttl, registration)
+                if len(self._client_cache) > self._client_cache_max:
+                    self._client_cache.popitem(last=False)
+        return registration
     
     def update_client(self, 
                      client_id: str,
                      registration_token: str, 
-                     update_data: Dict[str, Any]) -> Dict[str, Any]:
+                     update_data: Dict[str, Any]) -> ClientRegistrationResponse:
         """
         Update existing client registration
         
@@ -216,33 +381,35 @@ class DynamicClientRegistry:
         if not self._validate_registration_token(registration_token, client_id):
             raise ClientRegistrationError("invalid_token", "Invalid registration access token")
         
-        # Get existing registration
-        client_registration = self.registered_clients.get(client_id)
-        if not client_registration:
-            raise ClientRegistrationError("invalid_client_id", "Client not found")
-        
-        try:
-            # Validate update data
-            validated_data = self._validate_registration_request(update_data, is_update=True)
-            
-            # Update fields
-            for field, value in validated_data.items():
-                if hasattr(client_registration, field):
-                    setattr(client_registration, field, value)
-            
-            # Store updated registration
-            self.registered_clients[client_id] = client_registration
-            
-            response = self._build_registration_response(client_registration)
-            
-            logger.info(f"Client updated: {client_id}")
-            return response
+        with self._lock_for(client_id):
+            # Get existing registration
+            client_registration = self.registered_clients.get(client_id)
+            if not client_registration:
+                raise ClientRegistrationError("invalid_client_id", "Client not found")
             
-        except Exception as e:
-            if isinstance(e, ClientRegistrationError):
-                raise
-            logger.error(f"Client update failed: {e}")
-            raise ClientRegistrationError("server_error", "Internal update error")
+            try:
+                # Validate update data
+                validated_data = self._validate_registration_request(update_data, is_update=True)
+                
+                # Update fields
+                for field, value in validated_data.items():
+                    if hasattr(client_registration, field):
+                        setattr(client_registration, field, value)
+                
+                # Store updated registration
+                self._persist_registration(client_registration)
+                self._evict_cached_client(client_id)
+                
+                response = self._build_registration_response(client_registration)
+                
+                logger.info(f"Client updated: {client_id}")
+                return response
+                
+            except Exception as e:
+                if isinstance(e, ClientRegistrationError):
+                    raise
+                logger.error(f"Client update failed: {e}")
+                raise ClientRegistrationError("server_error", "Internal update error")
     
     def delete_client(self, client_id: str, registration_token: str) -> bool:
         """
@@ -262,17 +429,20 @@ class DynamicClientRegistry:
         if not self._validate_registration_token(registration_token, client_id):
             raise ClientRegistrationError("invalid_token", "Invalid registration access token")
         
-        # Remove client and token
-        if client_id in self.registered_clients:
-            del self.registered_clients[client_id]
+        with self._lock_for(client_id):
+            # Remove client and token
+            if client_id in self.registered_clients:
+                del self.registered_clients[client_id]
+                self._unindex_summary(client_id)
+            self._evict_cached_client(client_id)
+                
+            # Clean up registration tokens
+            for token in self._client_tokens.pop(client_id, ()):
+                self.registration_tokens.pop(token, None)
+            self._locks.pop(client_id, None)
             
-        # Clean up registration tokens
-        for token, data in list(self.registration_tokens.items()):
-            if data.get("client_id") == client_id:
-                del self.registration_tokens[token]
-        
-        logger.info(f"Client deleted: {client_id}")
-        return True
+            logger.info(f"Client deleted: {client_id}")
+            return True
     
     def list_clients(self) -> List[Dict[str, Any]]:
         """
@@ -281,16 +451,22 @@ class DynamicClientRegistry:
         Returns:
             List of client summaries
         """
-        clients = []
-        for client_id, registration in self.registered_clients.items():
-            clients.append({
+        # Snapshot the columns together; removals move rows column by column
+        with self._summary_lock:
+            rows = list(zip(
+                self._sum_ids, self._sum_names, self._sum_issued, self._sum_scopes, self._sum_grants
+            ))
+        
+        return [
+            {
                 "client_id": client_id,
-                "client_name": registration.client_name,
-                "issued_at": registration.client_id_issued_at,
-                "scope": registration.scope,
-                "grant_types": registration.grant_types
-            })
-        return clients
+                "client_name": client_name,
+                "issued_at": issued_at,
+                "scope": scope,
+                "grant_types": list(grant_types)
+            }
+            for client_id, client_name, issued_at, scope, grant_types in rows
+        ]
     
     def _validate_registration_request(self, 
                                      data: Dict[str, Any], 
@@ -308,158 +484,254 @@ class DynamicClientRegistry:
         Raises:
             ClientRegistrationError: If validation fails
         """
-        validated = {}
+        if not is_update:
+            if _native_validate_registration is not None:
+                try:
+                    validated = _native_validate_registration(data)
+                except _NativeRegistrationError as e:
+                    raise ClientRegistrationError(*e.args)
+            else:
+                validated = self._validate_common_registration(data)
+            if validated is not None:
+                return validated
+        
+        try:
+            request = _RegistrationRequest.model_validate(data)
+        except ValidationError as e:
+            error = e.errors()[0]
+            field = error["loc"][0] if error["loc"] else ""
+            raise ClientRegistrationError(
+                "invalid_redirect_uri" if field == "redirect_uris" else "invalid_client_metadata",
+                f"{'.'.join(map(str, error['loc']))}: {error['msg']}"
+            )
         
         # Redirect URIs (required for new registrations)
-        redirect_uris = data.get("redirect_uris")
+        redirect_uris = request.redirect_uris
         if not is_update and not redirect_uris:
             raise ClientRegistrationError("invalid_redirect_uri", "redirect_uris is required")
         
-        if redirect_uris:
-            if not isinstance(redirect_uris, list):
-                raise ClientRegistrationError("invalid_redirect_uri", "redirect_uris must be array")
-            
-            validated_uris = []
-            for uri in redirect_uris:
-                parsed = urlparse(uri)
-                if not parsed.scheme or not parsed.netloc:
-                    raise ClientRegistrationError("invalid_redirect_uri", f"Invalid URI: {uri}")
-                
-                # OAuth 2.1 requires HTTPS for redirect URIs (except localhost)
-                if parsed.scheme != "https" and parsed.hostname not in ["localhost", "127.0.0.1"]:
-                    raise ClientRegistrationError(
-                        "invalid_redirect_uri",
-                        f"OAuth 2.1 requires HTTPS redirect URIs: {uri}"
-                    )
-                
-                validated_uris.append(uri)
-            
-            validated["redirect_uris"] = validated_uris
+        self._check_redirect_uris(redirect_uris or ())
         
-        # Grant types (must be OAuth 2.1 compliant)
-        grant_types = data.get("grant_types", ["authorization_code"])
-        invalid_grants = set(grant_types) - {"authorization_code", "refresh_token"}
-        if invalid_grants:
-            raise ClientRegistrationError(
-                "invalid_client_metadata",
-                f"OAuth 2.1 only supports authorization_code and refresh_token: {invalid_grants}"
-            )
-        validated["grant_types"] = grant_types
+        return {
+            field: value
+            for field, value in request.model_dump().items()
+            if value or field in _ALWAYS_VALIDATED_FIELDS
+        }
+    
+    def _validate_common_registration(self, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Fast path for the common registration shape
         
-        # Response types (must be 'code' for OAuth 2.1)
-        response_types = data.get("response_types", ["code"])
-        if response_types != ["code"]:
-            raise ClientRegistrationError(
-                "invalid_client_metadata",
-                "OAuth 2.1 only supports 'code' response type"
-            )
-        validated["response_types"] = response_types
+        Handles a new registration carrying only a short redirect_uris list,
+        plain string metadata and default-compatible grant, response type
+        and auth method values. Returns None for anything else so the full
+        schema validation runs instead.
+        """
+        if type(data) is not dict or not data.keys() <= _FAST_PATH_FIELDS:
+            return None
+        
+        redirect_uris = data.get("redirect_uris")
+        if (type(redirect_uris) is not list
+                or not 0 < len(redirect_uris) <= 3
+                or not all(type(uri) is str and len(uri) <= MAX_REDIRECT_URI_LENGTH
+                           for uri in redirect_uris)):
+            return None
+        
+        grant_types = data.get("grant_types", _DEFAULT_GRANT_TYPES)
+        if (type(grant_types) is not list
+                or not all(type(grant) is str and grant in _GRANT_TYPES for grant in grant_types)):
+            return None
+        
+        if data.get("response_types", _DEFAULT_RESPONSE_TYPES) != _DEFAULT_RESPONSE_TYPES:
+            return None
         
-        # Token endpoint auth method
         auth_method = data.get("token_endpoint_auth_method", "client_secret_basic")
-        valid_methods = [
-            "client_secret_basic",
-            "client_secret_post", 
-            "private_key_jwt",
-            "tls_client_auth",
-            "none"
-        ]
-        if auth_method not in valid_methods:
-            raise ClientRegistrationError(
-                "invalid_client_metadata",
-                f"Invalid token_endpoint_auth_method: {auth_method}"
-            )
-        validated["token_endpoint_auth_method"] = auth_method
+        if type(auth_method) is not str or auth_method not in _AUTH_METHODS:
+            return None
         
-        # Optional string fields
-        string_fields = [
-            "client_name", "client_uri", "scope", "logo_uri", 
-            "policy_uri", "tos_uri", "software_id", "software_version"
-        ]
-        for field in string_fields:
+        validated = {}
+        for field in _STRING_FIELDS:
             value = data.get(field)
-            if value:
-                if not isinstance(value, str):
-                    raise ClientRegistrationError(
-                        "invalid_client_metadata",
-                        f"{field} must be string"
-                    )
-                validated[field] = value
-        
-        # Contacts (array of strings)
-        contacts = data.get("contacts")
-        if contacts:
-            if not isinstance(contacts, list):
-                raise ClientRegistrationError("invalid_client_metadata", "contacts must be array")
-            
-            for contact in contacts:
-                if not isinstance(contact, str):
-                    raise ClientRegistrationError(
-                        "invalid_client_metadata",
-                        "contacts must be array of strings"
-                    )
-            validated["contacts"] = contacts
-        
-        # MCP-specific metadata
-        mcp_version = data.get("mcp_version", "2024-11-05")
-        validated["mcp_version"] = mcp_version
-        
-        mcp_capabilities = data.get("mcp_capabilities", ["resources", "tools", "prompts"])
-        if not isinstance(mcp_capabilities, list):
-            raise ClientRegistrationError(
-                "invalid_client_metadata",
-                "mcp_capabilities must be array"
-            )
-        validated["mcp_capabilities"] = mcp_capabilities
+            if value is not None:
+                if type(value) is not str:
+                    return None
+                if value:
+                    validated[field] = value
+        
+        self._check_redirect_uris(redirect_uris)
         
+        validated.update(
+            redirect_uris=list(redirect_uris),
+            grant_types=list(grant_types),
+            response_types=list(_CODE_RESPONSE_TYPES),
+            token_endpoint_auth_method=auth_method,
+            mcp_version="2024-11-05",
+            mcp_capabilities=list(_DEFAULT_MCP_CAPABILITIES)
+        )
         return validated
     
+    def _check_redirect_uris(self, redirect_uris: List[str]) -> None:
+        """Apply the redirect URI rules the schema can't express"""
+        for uri in redirect_uris:
+            # Redirect URIs must not carry a fragment (RFC 6749 section 3.1.2)
+            if "#" in uri:
+                raise ClientRegistrationError(
+                    "invalid_redirect_uri",
+                    f"Redirect URI must not contain a fragment: {uri}"
+                )
+            
+            # Common shapes are accepted on a prefix test alone
+            if uri.startswith(_LOOPBACK_PREFIXES) or (
+                    uri.startswith("https://") and uri[8:9] not in _NO_HOST_MARKERS):
+                continue
+            
+            match = _REDIRECT_URI_RE.match(uri)
+            if not match:
+                raise ClientRegistrationError("invalid_redirect_uri", f"Invalid URI: {uri}")
+            
+            # OAuth 2.1 requires HTTPS for redirect URIs (except localhost)
+            if (match.group("scheme").lower() != "https"
+                    and match.group("host").lower() not in _LOOPBACK_HOSTS):
+                raise ClientRegistrationError(
+                    "invalid_redirect_uri",
+                    f"OAuth 2.1 requires HTTPS redirect URIs: {uri}"
+                )
+    
     def _generate_client_id(self) -> str:
         """Generate unique client ID"""
-        return f"mcp-client-{uuid.uuid4().hex[:16]}"
+        return "mcp-client-" + _urandom(8).hex()
     
     def _generate_client_secret(self) -> str:
         """Generate client secret"""
-        return secrets.token_urlsafe(32)
+        return _b64encode(_urandom(32)).rstrip(b"=").decode("ascii")
     
     def _generate_registration_token(self) -> str:
         """Generate registration access token"""
-        return secrets.token_urlsafe(32)
+        return _b64encode(_urandom(32)).rstrip(b"=").decode("ascii")
+    
+    def _persist_registration(self,
+                              registration: ClientRegistration,
+                              token: Optional[str] = None) -> None:
+        """Write a registration and, optionally, its access token in one transaction"""
+        with self._store.transaction() as tx:
+            tx.upsert_client(registration)
+            if token:
+                self._store_registration_token(tx, token, registration.client_id)
+        self._index_summary(registration)
     
-    def _store_registration_token(self, token: str, client_id: str) -> None:
+    def _evict_cached_client(self, client_id: str) -> None:
+        """Drop a client from the get_client cache"""
+        with self._client_cache_lock:
+            self._client_cache.pop(client_id, None)
+    
+    def _lock_for(self, client_id: str) -> threading.Lock:
+        """Get the lock guarding a client's registration"""
+        lock = self._locks.get(client_id)
+        if lock is None:
+            lock = self._locks.setdefault(client_id, threading.Lock())
+        return lock
+    
+    def _index_summary(self, registration: ClientRegistration) -> None:
+        """Insert or refresh a client's row in the list_clients summary"""
+        with self._summary_lock:
+            pos = self._summary_pos.get(registration.client_id)
+            if pos is None:
+                self._summary_pos[registration.client_id] = len(self._sum_ids)
+                self._sum_ids.append(registration.client_id)
+                self._sum_names.append(registration.client_name)
+                self._sum_issued.append(registration.client_id_issued_at)
+                self._sum_scopes.append(registration.scope)
+                self._sum_grants.append(tuple(registration.grant_types))
+            else:
+                self._sum_names[pos] = registration.client_name
+                self._sum_issued[pos] = registration.client_id_issued_at
+                self._sum_scopes[pos] = registration.scope
+                self._sum_grants[pos] = tuple(registration.grant_types)
+    
+    def _unindex_summary(self, client_id: str) -> None:
+        """Remove a client's summary row, moving the last row into its slot"""
+        with self._summary_lock:
+            pos = self._summary_pos.pop(client_id, None)
+            if pos is None:
+                return
+            columns = (self._sum_ids, self._sum_names, self._sum_issued, self._sum_scopes, self._sum_grants)
+            last = len(self._sum_ids) - 1
+            if pos != last:
+                for column in columns:
+                    column[pos] = column[last]
+                self._summary_pos[self._sum_ids[pos]] = pos
+            for column in columns:
+                column.pop()
+    
+    def _store_registration_token(self, tx: _InMemoryClientStore, token: str, client_id: str) -> None:
         """Store registration access token"""
-        self.registration_tokens[token] = {
-            "client_id": client_id,
-            "created_at": datetime.now(timezone.utc),
-            "expires_at": datetime.now(timezone.utc) + timedelta(seconds=self.registration_token_expiry)
-        }
+        expires_at = int(time.time()) + self.registration_token_expiry
+        tx.upsert_token(self._hash_token(token), client_id, expires_at)
+        
+        self._writes_since_sweep += 1
+        self._maybe_sweep()
+    
+    def _maybe_sweep(self) -> None:
+        """Drop expired registration tokens once every _sweep_every writes"""
+        if self._writes_since_sweep < self._sweep_every:
+            return
+        self._writes_since_sweep = 0
+        
+        now = time.time()
+        swept = 0
+        for token_hash, (client_id, expires_at) in list(self.registration_tokens.items()):
+            if expires_at < now:
+                self.registration_tokens.pop(token_hash, None)
+                self._client_tokens.get(client_id, set()).discard(token_hash)
+                swept += 1
+        
+        if swept:
+            logger.debug(f"Swept {swept} expired registration tokens")
     
     def _validate_registration_token(self, token: str, client_id: str) -> bool:
         """Validate registration access token"""
-        token_data = self.registration_tokens.get(token)
+        token_hash = self._hash_token(token)
+        token_data = self.registration_tokens.get(token_hash)
         if not token_data:
             return False
         
-        if token_data["client_id"] != client_id:
+        token_client_id, expires_at = token_data
+        if not hmac.compare_digest(token_client_id.encode(), client_id.encode()):
             return False
         
-        if datetime.now(timezone.utc) > token_data["expires_at"]:
-            del self.registration_tokens[token]
+        if time.time() > expires_at:
+            self.registration_tokens.pop(token_hash, None)
+            self._client_tokens.get(client_id, set()).discard(token_hash)
             return False
         
         return True
     
-    def _build_registration_response(self, registration: ClientRegistration) -> Dict[str, Any]:
+    @staticmethod
+    def _hash_token(token: str) -> bytes:
+        """Hash a registration access token for storage and lookup"""
+        return hashlib.sha256(token.encode()).digest()
+    
+    def _build_registration_response(self, registration: ClientRegistration) -> ClientRegistrationResponse:
         """Build client registration response"""
         response = {
             "client_id": registration.client_id,
             "client_name": registration.client_name,
-            "redirect_uris": registration.redirect_uris,
-            "grant_types": registration.grant_types,
-            "response_types": registration.response_types,
+            # List fields may hold the shared tuple defaults; responses carry lists
+            "redirect_uris": list(registration.redirect_uris),
+            "grant_types": list(registration.grant_types),
+            "response_types": list(registration.response_types),
             "token_endpoint_auth_method": registration.token_endpoint_auth_method,
             "scope": registration.scope,
-            "client_id_issued_at": registration.client_id_issued_at
+            "client_id_issued_at": registration.client_id_issued_at,
+            # Add optional fields that are set
+            **{
+                field: list(value) if field == "contacts" else value
+                for field in _OPTIONAL_RESPONSE_FIELDS
+                if (value := getattr(registration, field))
+            },
+            # Add MCP-specific metadata
+            "mcp_version": registration.mcp_version,
+            "mcp_capabilities": list(registration.mcp_capabilities)
         }
         
         # Add client secret if present
@@ -467,25 +739,11 @@ class DynamicClientRegistry:
             response["client_secret"] = registration.client_secret
             response["client_secret_expires_at"] = registration.client_secret_expires_at
         
-        # Add optional fields
-        optional_fields = [
-            "client_uri", "logo_uri", "policy_uri", "tos_uri",
-            "contacts", "software_id", "software_version"
-        ]
-        for field in optional_fields:
-            value = getattr(registration, field)
-            if value:
-                response[field] = value
-        
         # Add registration management
         if registration.registration_access_token:
             response["registration_access_token"] = registration.registration_access_token
             response["registration_client_uri"] = registration.registration_client_uri
         
-        # Add MCP-specific metadata
-        response["mcp_version"] = registration.mcp_version
-        response["mcp_capabilities"] = registration.mcp_capabilities
-        
         return response
 
 # Convenience functions
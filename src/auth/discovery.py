@@ -7,11 +7,84 @@ RFC 9728 (OAuth 2.0 Protected Resource Metadata) for MCP compliance.
 
 import json
 import logging
-from typing import Dict, Any, List, Optional
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timezone
+from urllib.parse import urlparse
 
 logger = logging.getLogger(__name__)
 
+# Recognized discovery endpoint paths
+_DISCOVERY_ENDPOINTS = frozenset({
+    "/.well-known/oauth-authorization-server",
+    "/.well-known/oauth-protected-resource",
+    "/.well-known/openid_configuration",
+    "/.well-known/jwks.json"
+})
+
+# Static metadata values, shared by every generated document
+_RESPONSE_TYPES = ("code",)
+_GRANT_TYPES = ("authorization_code", "refresh_token")
+_CODE_CHALLENGE_METHODS = ("S256", "plain")
+_TOKEN_AUTH_METHODS = (
+    "client_secret_basic",
+    "client_secret_post",
+    "private_key_jwt",
+    "tls_client_auth",
+    "none"  # For public clients with PKCE
+)
+_TOKEN_AUTH_SIGNING_ALGS = (
+    "HS256", "HS384", "HS512",
+    "RS256", "RS384", "RS512",
+    "ES256", "ES384", "ES512"
+)
+_RESPONSE_MODES = ("query", "fragment")
+_SUBJECT_TYPES = ("public",)
+_BEARER_METHODS = ("header",)  # Authorization: Bearer <token>
+_RESOURCE_SIGNING_ALGS = ("HS256", "RS256")
+_MCP_VERSIONS = ("2024-11-05",)
+_MCP_CAPABILITIES = ("resources", "tools", "prompts", "logging")
+
+@lru_cache(maxsize=256)
+def _protected_resource_metadata(issuer: str,
+                                 supported_scopes: Tuple[str, ...],
+                                 resource_uri: str) -> Dict[str, Any]:
+    """Build protected resource metadata, memoized per issuer, scopes and resource"""
+    metadata = {
+        # Core resource metadata
+        "resource": resource_uri,
+        "authorization_servers": (issuer,),
+        
+        # Bearer token requirements
+        "bearer_methods_supported": _BEARER_METHODS,
+        "resource_signing_alg_values_supported": _RESOURCE_SIGNING_ALGS,
+        
+        # Scopes required for this resource
+        "scopes_supported": supported_scopes,
+        
+        # Token requirements
+        "bearer_token_type": "Bearer",
+        
+        # MCP specific requirements
+        "mcp_version_supported": _MCP_VERSIONS,
+        "mcp_capabilities": _MCP_CAPABILITIES,
+        
+        # Resource-specific metadata
+        "resource_documentation": f"{resource_uri}/docs",
+        "resource_policy_uri": f"{resource_uri}/policy"
+    }
+    
+    logger.debug(f"Generated protected resource metadata for: {resource_uri}")
+    return metadata
+
+@lru_cache(maxsize=256)
+def _protected_resource_metadata_json(issuer: str,
+                                      supported_scopes: Tuple[str, ...],
+                                      resource_uri: str) -> bytes:
+    """Protected resource metadata serialized as a JSON response body"""
+    metadata = _protected_resource_metadata(issuer, supported_scopes, resource_uri)
+    return json.dumps(metadata, separators=(",", ":")).encode()
+
 class DiscoveryService:
     """
     OAuth 2.1 Discovery Service for MCP Authorization
@@ -35,8 +108,19 @@ class DiscoveryService:
             supported_resources: List of supported resource indicators
         """
         self.issuer = issuer.rstrip('/')
-        self.supported_scopes = supported_scopes or ["read", "write", "admin"]
-        self.supported_resources = supported_resources or []
+        self.supported_scopes = list(supported_scopes or ["read", "write", "admin"])
+        self.supported_resources = list(supported_resources or [])
+        self._issuer_host = urlparse(self.issuer).netloc
+        
+        # Metadata is a pure function of the constructor arguments; build it once.
+        # Values are immutable, so getters hand out cheap shallow copies
+        self._as_metadata = self._build_authorization_server_metadata()
+        self._as_metadata_json = json.dumps(self._as_metadata, separators=(",", ":")).encode()
+        self._openid_configuration = self._build_openid_configuration()
+        self._openid_configuration_json = json.dumps(
+            self._openid_configuration, separators=(",", ":")
+        ).encode()
+        self._server_capabilities = self._build_server_capabilities()
         
         logger.info(f"DiscoveryService initialized for issuer: {self.issuer}")
     
@@ -46,6 +130,14 @@ class DiscoveryService:
         
         Available at: /.well-known/oauth-authorization-server
         """
+        return dict(self._as_metadata)
+    
+    def get_authorization_server_metadata_bytes(self) -> bytes:
+        """Authorization server metadata pre-serialized as a JSON response body"""
+        return self._as_metadata_json
+    
+    def _build_authorization_server_metadata(self) -> Dict[str, Any]:
+        """Build the authorization server metadata document"""
         metadata = {
             # Core OAuth 2.1 metadata
             "issuer": self.issuer,
@@ -55,28 +147,18 @@ class DiscoveryService:
             "introspection_endpoint": f"{self.issuer}/oauth/introspect",
             
             # OAuth 2.1 specific requirements
-            "response_types_supported": ["code"],
-            "grant_types_supported": ["authorization_code", "refresh_token"],
-            "code_challenge_methods_supported": ["S256", "plain"],
+            "response_types_supported": _RESPONSE_TYPES,
+            "grant_types_supported": _GRANT_TYPES,
+            "code_challenge_methods_supported": _CODE_CHALLENGE_METHODS,
             
             # Token endpoint authentication
-            "token_endpoint_auth_methods_supported": [
-                "client_secret_basic",
-                "client_secret_post",
-                "private_key_jwt",
-                "tls_client_auth",
-                "none"  # For public clients with PKCE
-            ],
-            "token_endpoint_auth_signing_alg_values_supported": [
-                "HS256", "HS384", "HS512",
-                "RS256", "RS384", "RS512", 
-                "ES256", "ES384", "ES512"
-            ],
+            "token_endpoint_auth_methods_supported": _TOKEN_AUTH_METHODS,
+            "token_endpoint_auth_signing_alg_values_supported": _TOKEN_AUTH_SIGNING_ALGS,
             
             # Scopes and capabilities
-            "scopes_supported": self.supported_scopes,
-            "response_modes_supported": ["query", "fragment"],
-            "subject_types_supported": ["public"],
+            "scopes_supported": tuple(self.supported_scopes),
+            "response_modes_supported": _RESPONSE_MODES,
+            "subject_types_supported": _SUBJECT_TYPES,
             
             # Security features
             "require_signed_request_object": False,
@@ -100,7 +182,7 @@ class DiscoveryService:
         # Add resource-specific metadata if resources are defined
         if self.supported_resources:
             metadata["resource_indicators_supported"] = True
-            metadata["resources_supported"] = self.supported_resources
+            metadata["resources_supported"] = tuple(self.supported_resources)
         
         logger.debug("Generated authorization server metadata")
         return metadata
@@ -111,37 +193,15 @@ class DiscoveryService:
         
         Available at: /.well-known/oauth-protected-resource
         """
-        metadata = {
-            # Core resource metadata
-            "resource": resource_uri,
-            "authorization_servers": [self.issuer],
-            
-            # Bearer token requirements
-            "bearer_methods_supported": ["header"],  # Authorization: Bearer <token>
-            "resource_signing_alg_values_supported": ["HS256", "RS256"],
-            
-            # Scopes required for this resource
-            "scopes_supported": self.supported_scopes,
-            
-            # Token requirements
-            "bearer_token_type": "Bearer",
-            
-            # MCP specific requirements
-            "mcp_version_supported": ["2024-11-05"],
-            "mcp_capabilities": [
-                "resources",
-                "tools", 
-                "prompts",
-                "logging"
-            ],
-            
-            # Resource-specific metadata
-            "resource_documentation": f"{resource_uri}/docs",
-            "resource_policy_uri": f"{resource_uri}/policy"
-        }
-        
-        logger.debug(f"Generated protected resource metadata for: {resource_uri}")
-        return metadata
+        return dict(
+            _protected_resource_metadata(self.issuer, tuple(self.supported_scopes), resource_uri)
+        )
+    
+    def get_protected_resource_metadata_bytes(self, resource_uri: str) -> bytes:
+        """Protected resource metadata pre-serialized as a JSON response body"""
+        return _protected_resource_metadata_json(
+            self.issuer, tuple(self.supported_scopes), resource_uri
+        )
     
     def get_jwks(self, public_keys: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -165,20 +225,28 @@ class DiscoveryService:
         
         Available at: /.well-known/openid_configuration
         """
-        # Start with OAuth metadata
-        metadata = self.get_authorization_server_metadata()
+        return dict(self._openid_configuration)
+    
+    def get_openid_configuration_bytes(self) -> bytes:
+        """OpenID Connect discovery metadata pre-serialized as a JSON response body"""
+        return self._openid_configuration_json
+    
+    def _build_openid_configuration(self) -> Dict[str, Any]:
+        """Build the OpenID Connect discovery document"""
+        # Start with a copy of the OAuth metadata
+        metadata = dict(self._as_metadata)
         
         # Add OpenID Connect specific metadata
         oidc_metadata = {
             "userinfo_endpoint": f"{self.issuer}/oauth/userinfo",
-            "id_token_signing_alg_values_supported": ["HS256", "RS256"],
-            "subject_types_supported": ["public"],
-            "response_types_supported": ["code", "id_token", "code id_token"],
-            "claims_supported": [
+            "id_token_signing_alg_values_supported": ("HS256", "RS256"),
+            "subject_types_supported": _SUBJECT_TYPES,
+            "response_types_supported": ("code", "id_token", "code id_token"),
+            "claims_supported": (
                 "sub", "iss", "aud", "exp", "iat", "auth_time",
                 "email", "email_verified", "name", "given_name", "family_name"
-            ],
-            "claim_types_supported": ["normal"],
+            ),
+            "claim_types_supported": ("normal",),
             "claims_parameter_supported": False,
             "request_parameter_supported": False,
             "request_uri_parameter_supported": False
@@ -211,20 +279,12 @@ class DiscoveryService:
             return False
         
         # Validate host matches issuer
-        issuer_host = self.issuer.split("://")[1].split("/")[0]
-        if host != issuer_host:
-            logger.warning(f"Host mismatch: {host} vs {issuer_host}")
+        if host != self._issuer_host:
+            logger.warning(f"Host mismatch: {host} vs {self._issuer_host}")
             return False
         
         # Validate endpoint is a recognized discovery endpoint
-        valid_endpoints = [
-            "/.well-known/oauth-authorization-server",
-            "/.well-known/oauth-protected-resource",
-            "/.well-known/openid_configuration",
-            "/.well-known/jwks.json"
-        ]
-        
-        if endpoint not in valid_endpoints:
+        if endpoint not in _DISCOVERY_ENDPOINTS:
             logger.warning(f"Unknown discovery endpoint: {endpoint}")
             return False
         
@@ -234,11 +294,17 @@ class DiscoveryService:
         """
         Get comprehensive server capabilities for MCP clients
         """
+        capabilities = dict(self._server_capabilities)
+        capabilities["discovery_endpoints"] = dict(capabilities["discovery_endpoints"])
+        return capabilities
+    
+    def _build_server_capabilities(self) -> Dict[str, Any]:
+        """Build the server capabilities document"""
         return {
             # OAuth 2.1 compliance
             "oauth_version": "2.1",
             "pkce_required": True,
-            "supported_flows": ["authorization_code"],
+            "supported_flows": ("authorization_code",),
             
             # Security features
             "tls_required": True,
@@ -252,12 +318,12 @@ class DiscoveryService:
             
             # Client support
             "dynamic_registration": True,
-            "client_authentication_methods": [
+            "client_authentication_methods": (
                 "client_secret_basic",
                 "client_secret_post",
                 "private_key_jwt", 
                 "tls_client_auth"
-            ],
+            ),
             
             # Discovery endpoints
             "discovery_endpoints": {
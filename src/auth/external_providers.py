@@ -11,20 +11,101 @@ Integrates with popular OAuth providers for user authentication:
 The MCP server acts as a resource server, validating tokens from these providers.
 """
 
-import json
+import asyncio
+import copy
+import hashlib
 import logging
+import os
 import time
 from abc import ABC, abstractmethod
-from datetime import datetime, timezone, timedelta
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from functools import lru_cache, partial
+from importlib.util import find_spec
 from typing import Dict, Any, Optional, List
 import httpx
 import jwt
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import rsa
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+
+# orjson parses response bodies straight from bytes when installed
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
 
 logger = logging.getLogger(__name__)
 
+# One pooled client for all provider calls; HTTP/2 when the h2 extra is installed
+_http_client: Optional[httpx.AsyncClient] = None
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Get the shared provider HTTP client, creating it on first use"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            http2=find_spec("h2") is not None,
+            timeout=5.0,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+        )
+    return _http_client
+
+async def close_http_client() -> None:
+    """Close the shared provider HTTP client (call on application shutdown)"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+# RSA signature checks are CPU-bound; run them off the event loop
+_VERIFY_POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 4, thread_name_prefix="jwt-verify")
+
+async def _verify_jwt(token: str, key: Any, **kwargs: Any) -> Dict[str, Any]:
+    """jwt.decode on the verification pool"""
+    return await asyncio.get_running_loop().run_in_executor(
+        _VERIFY_POOL, partial(jwt.decode, token, key, **kwargs)
+    )
+
+# Validation results are answered from memory for a short while: successes
+# until the token expires (at most POSITIVE_CACHE_TTL), rejections so replays
+# of a bad token don't fan out to every provider again
+POSITIVE_CACHE_TTL = 300  # seconds
+# Opaque tokens carry no exp, so revocation is only noticed on the next lookup
+OPAQUE_TOKEN_CACHE_TTL = 30  # seconds
+NEGATIVE_CACHE_TTL = 60  # seconds
+TOKEN_CACHE_MAXSIZE = 10000
+
+# Per-process key, so cache keys reveal nothing about token equality elsewhere
+_TOKEN_CACHE_SALT = os.urandom(16)
+
+def _token_cache_key(token: str) -> bytes:
+    """Fixed-size, salted cache key for a raw token"""
+    return hashlib.blake2b(token.encode(), digest_size=16, key=_TOKEN_CACHE_SALT).digest()
+
+def _cache_get(cache: OrderedDict, key: bytes) -> Any:
+    """Return a live entry from a TTL cache, or None"""
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    if entry[0] <= time.monotonic():
+        del cache[key]
+        return None
+    return entry[1]
+
+def _cache_set(cache: OrderedDict, key: bytes, value: Any, ttl: float) -> None:
+    """Store an entry in a TTL cache, evicting the oldest beyond the size bound"""
+    cache[key] = (time.monotonic() + ttl, value)
+    cache.move_to_end(key)
+    if len(cache) > TOKEN_CACHE_MAXSIZE:
+        cache.popitem(last=False)
+
+@lru_cache(maxsize=4096)
+def _domain_to_tenant(domain: str) -> str:
+    """Derive a tenant ID from an email domain"""
+    return domain.replace(".", "_")
+
 @dataclass
 class ExternalUserInfo:
     """User information from external provider"""
@@ -43,13 +124,33 @@ class ExternalUserInfo:
         
         # Auto-generate tenant_id from email domain if not provided
         if not self.tenant_id and self.email:
-            domain = self.email.split("@")[-1] if "@" in self.email else "default"
-            self.tenant_id = domain.replace(".", "_")
+            _, at, domain = self.email.rpartition("@")
+            self.tenant_id = _domain_to_tenant(domain if at else "default")
+    
+    def copy(self) -> "ExternalUserInfo":
+        """Independent copy, so callers can't alter a cached result"""
+        return replace(self, raw_claims=copy.deepcopy(self.raw_claims))
+
+def _index_signing_keys(jwks: Dict[str, Any]) -> Dict[Optional[str], Any]:
+    """Parse a JWKS once into a key ID -> RSA public key map"""
+    return {
+        key.get("kid"): jwt.algorithms.RSAAlgorithm.from_jwk(key)
+        for key in jwks.get("keys", [])
+        if key.get("kty") == "RSA"
+    }
 
 class TokenValidationError(Exception):
     """External token validation error"""
     pass
 
+class ProviderUnavailableError(TokenValidationError):
+    """The provider couldn't be reached or asked us to back off; the token was not judged"""
+    pass
+
+def _is_transient_status(response: httpx.Response) -> bool:
+    """Whether an HTTP status says nothing about the token (rate limits, server errors)"""
+    return response.status_code == 429 or response.status_code >= 500
+
 class ExternalProvider(ABC):
     """Abstract base class for external identity providers"""
     
@@ -73,6 +174,41 @@ class ExternalProvider(ABC):
     def get_provider_name(self) -> str:
         """Get provider name identifier"""
         pass
+    
+    def expected_issuer(self) -> Optional[str]:
+        """JWT issuer this provider accepts, or None if it doesn't issue JWTs"""
+        return None
+    
+    # Seconds between background signing key refreshes; None disables them
+    KEY_REFRESH_INTERVAL: Optional[float] = None
+    _refresh_task: Optional[asyncio.Task] = None
+    
+    async def refresh_signing_keys(self) -> None:
+        """Refetch cached signing keys ahead of expiry"""
+        pass
+    
+    def start(self) -> None:
+        """Start background key refresh; must be called from a running event loop"""
+        if self.KEY_REFRESH_INTERVAL and self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+    
+    async def stop(self) -> None:
+        """Stop background key refresh"""
+        task, self._refresh_task = self._refresh_task, None
+        if task:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+    
+    async def _refresh_loop(self) -> None:
+        """Keep signing keys warm so foreground validations never wait on a fetch"""
+        while True:
+            await asyncio.sleep(self.KEY_REFRESH_INTERVAL)
+            try:
+                await self.refresh_signing_keys()
+            except Exception as e:
+                # Validations keep using the last good keys
+                logger.warning(f"Background key refresh failed for {self.get_provider_name()}: {e}")
 
 class GoogleProvider(ExternalProvider):
     """
@@ -83,6 +219,7 @@ class GoogleProvider(ExternalProvider):
     
     GOOGLE_DISCOVERY_URL = "https://accounts.google.com/.well-known/openid_configuration"
     GOOGLE_USERINFO_URL = "https://www.googleapis.com/oauth2/v2/userinfo"
+    KEY_REFRESH_INTERVAL = 55 * 60  # JWKS cache lives one hour
     
     def __init__(self, client_id: str, client_secret: Optional[str] = None):
         """
@@ -96,7 +233,13 @@ class GoogleProvider(ExternalProvider):
         self.client_secret = client_secret
         self._discovery_cache: Optional[Dict] = None
         self._jwks_cache: Optional[Dict] = None
-        self._cache_expiry: Optional[datetime] = None
+        self._signing_keys: Dict[Optional[str], Any] = {}
+        self._cache_expiry = 0.0
+        self._discovery_expiry = 0.0
+        
+        # Single-flight refresh locks so concurrent misses share one fetch
+        self._jwks_lock = asyncio.Lock()
+        self._discovery_lock = asyncio.Lock()
         
         logger.info("GoogleProvider initialized")
     
@@ -112,12 +255,15 @@ class GoogleProvider(ExternalProvider):
         """
         try:
             # Try as ID token first (JWT format)
-            if "." in token and token.count(".") == 2:
+            if token.count(".") == 2:
                 return await self._validate_id_token(token)
             else:
                 # Try as access token
                 return await self._validate_access_token(token)
                 
+        except ProviderUnavailableError as e:
+            logger.warning(f"Google unavailable for token validation: {e}")
+            raise
         except Exception as e:
             logger.error(f"Google token validation failed: {e}")
             raise TokenValidationError(f"Invalid Google token: {e}")
@@ -126,25 +272,18 @@ class GoogleProvider(ExternalProvider):
         """Validate Google ID token (JWT)"""
         
         # Get Google's public keys
-        jwks = await self._get_google_jwks()
+        await self._get_google_jwks()
         
         try:
             # Decode and verify JWT
             header = jwt.get_unverified_header(id_token)
-            key_id = header.get("kid")
-            
-            # Find matching key
-            signing_key = None
-            for key in jwks.get("keys", []):
-                if key.get("kid") == key_id:
-                    signing_key = jwt.algorithms.RSAAlgorithm.from_jwk(json.dumps(key))
-                    break
+            signing_key = self._signing_keys.get(header.get("kid"))
             
             if not signing_key:
                 raise TokenValidationError("No matching signing key found")
             
             # Verify token
-            payload = jwt.decode(
+            payload = await _verify_jwt(
                 id_token,
                 signing_key,
                 algorithms=["RS256"],
@@ -170,79 +309,93 @@ class GoogleProvider(ExternalProvider):
         """Validate Google access token by calling userinfo endpoint"""
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    self.GOOGLE_USERINFO_URL,
-                    headers={"Authorization": f"Bearer {access_token}"}
-                )
-                
-                if response.status_code != 200:
-                    raise TokenValidationError(f"Google userinfo error: {response.status_code}")
-                
-                user_data = response.json()
-                
-                return ExternalUserInfo(
-                    provider="google",
-                    provider_user_id=user_data["id"],
-                    email=user_data.get("email", ""),
-                    name=user_data.get("name"),
-                    picture=user_data.get("picture"),
-                    email_verified=user_data.get("verified_email", False),
-                    raw_claims=user_data
+            response = await _get_http_client().get(
+                self.GOOGLE_USERINFO_URL,
+                headers={"Authorization": f"Bearer {access_token}"}
+            )
+            
+            if response.status_code != 200:
+                error_type = (
+                    ProviderUnavailableError if _is_transient_status(response) else TokenValidationError
                 )
-                
+                raise error_type(f"Google userinfo error: {response.status_code}")
+            
+            user_data = _json_loads(response.content)
+            
+            return ExternalUserInfo(
+                provider="google",
+                provider_user_id=user_data["id"],
+                email=user_data.get("email", ""),
+                name=user_data.get("name"),
+                picture=user_data.get("picture"),
+                email_verified=user_data.get("verified_email", False),
+                raw_claims=user_data
+            )
+            
         except httpx.RequestError as e:
-            raise TokenValidationError(f"Google userinfo request failed: {e}")
+            raise ProviderUnavailableError(f"Google userinfo request failed: {e}")
     
-    async def _get_google_jwks(self) -> Dict[str, Any]:
+    async def _get_google_jwks(self, force: bool = False) -> Dict[str, Any]:
         """Get Google's JWKS with caching"""
         
-        if (self._jwks_cache and self._cache_expiry and 
-            datetime.now(timezone.utc) < self._cache_expiry):
+        if not force and self._jwks_cache and time.monotonic() < self._cache_expiry:
             return self._jwks_cache
         
-        try:
-            # Get discovery document first
-            discovery = await self._get_google_discovery()
-            jwks_uri = discovery.get("jwks_uri")
-            
-            if not jwks_uri:
-                raise TokenValidationError("No JWKS URI in Google discovery document")
+        async with self._jwks_lock:
+            if not force and self._jwks_cache and time.monotonic() < self._cache_expiry:
+                return self._jwks_cache
             
-            async with httpx.AsyncClient() as client:
-                response = await client.get(jwks_uri)
+            try:
+                # Get discovery document first
+                discovery = await self._get_google_discovery()
+                jwks_uri = discovery.get("jwks_uri")
+                
+                if not jwks_uri:
+                    raise TokenValidationError("No JWKS URI in Google discovery document")
+                
+                response = await _get_http_client().get(jwks_uri)
                 response.raise_for_status()
                 
-                self._jwks_cache = response.json()
-                self._cache_expiry = datetime.now(timezone.utc) + timedelta(hours=1)
+                jwks = _json_loads(response.content)
+                self._signing_keys = _index_signing_keys(jwks)
+                self._jwks_cache = jwks
+                self._cache_expiry = time.monotonic() + 3600
                 
                 return self._jwks_cache
                 
-        except Exception as e:
-            raise TokenValidationError(f"Failed to fetch Google JWKS: {e}")
+            except Exception as e:
+                raise ProviderUnavailableError(f"Failed to fetch Google JWKS: {e}")
     
     async def _get_google_discovery(self) -> Dict[str, Any]:
         """Get Google discovery document with caching"""
         
-        if (self._discovery_cache and self._cache_expiry and 
-            datetime.now(timezone.utc) < self._cache_expiry):
+        if self._discovery_cache and time.monotonic() < self._discovery_expiry:
             return self._discovery_cache
         
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(self.GOOGLE_DISCOVERY_URL)
+        async with self._discovery_lock:
+            if self._discovery_cache and time.monotonic() < self._discovery_expiry:
+                return self._discovery_cache
+            
+            try:
+                response = await _get_http_client().get(self.GOOGLE_DISCOVERY_URL)
                 response.raise_for_status()
                 
-                self._discovery_cache = response.json()
-                self._cache_expiry = datetime.now(timezone.utc) + timedelta(hours=1)
+                self._discovery_cache = _json_loads(response.content)
+                self._discovery_expiry = time.monotonic() + 3600
                 
                 return self._discovery_cache
                 
-        except Exception as e:
-            raise TokenValidationError(f"Failed to fetch Google discovery: {e}")
+            except Exception as e:
+                raise ProviderUnavailableError(f"Failed to fetch Google discovery: {e}")
     
     def get_provider_name(self) -> str:
         return "google"
+    
+    def expected_issuer(self) -> Optional[str]:
+        return "https://accounts.google.com"
+    
+    async def refresh_signing_keys(self) -> None:
+        await self._get_google_jwks(force=True)
 
 class Auth0Provider(ExternalProvider):
     """
@@ -251,6 +404,8 @@ class Auth0Provider(ExternalProvider):
     Validates Auth0 access tokens and ID tokens.
     """
     
+    KEY_REFRESH_INTERVAL = 55 * 60  # JWKS cache lives one hour
+    
     def __init__(self, domain: str, audience: str):
         """
         Initialize Auth0 provider
@@ -263,7 +418,9 @@ class Auth0Provider(ExternalProvider):
         self.audience = audience
         self.issuer = f"https://{domain}/"
         self._jwks_cache: Optional[Dict] = None
-        self._cache_expiry: Optional[datetime] = None
+        self._signing_keys: Dict[Optional[str], Any] = {}
+        self._cache_expiry = 0.0
+        self._jwks_lock = asyncio.Lock()
         
         logger.info(f"Auth0Provider initialized: {domain}")
     
@@ -279,24 +436,17 @@ class Auth0Provider(ExternalProvider):
         """
         try:
             # Get Auth0 JWKS
-            jwks = await self._get_auth0_jwks()
+            await self._get_auth0_jwks()
             
-            # Decode JWT header
+            # Decode JWT header and look up the signing key
             header = jwt.get_unverified_header(token)
-            key_id = header.get("kid")
-            
-            # Find signing key
-            signing_key = None
-            for key in jwks.get("keys", []):
-                if key.get("kid") == key_id:
-                    signing_key = jwt.algorithms.RSAAlgorithm.from_jwk(json.dumps(key))
-                    break
+            signing_key = self._signing_keys.get(header.get("kid"))
             
             if not signing_key:
                 raise TokenValidationError("No matching Auth0 signing key found")
             
             # Verify token
-            payload = jwt.decode(
+            payload = await _verify_jwt(
                 token,
                 signing_key,
                 algorithms=["RS256"],
@@ -322,34 +472,47 @@ class Auth0Provider(ExternalProvider):
             
         except jwt.InvalidTokenError as e:
             raise TokenValidationError(f"Invalid Auth0 token: {e}")
+        except ProviderUnavailableError as e:
+            logger.warning(f"Auth0 unavailable for token validation: {e}")
+            raise
         except Exception as e:
             logger.error(f"Auth0 token validation failed: {e}")
             raise TokenValidationError(f"Auth0 validation error: {e}")
     
-    async def _get_auth0_jwks(self) -> Dict[str, Any]:
+    async def _get_auth0_jwks(self, force: bool = False) -> Dict[str, Any]:
         """Get Auth0 JWKS with caching"""
         
-        if (self._jwks_cache and self._cache_expiry and 
-            datetime.now(timezone.utc) < self._cache_expiry):
+        if not force and self._jwks_cache and time.monotonic() < self._cache_expiry:
             return self._jwks_cache
         
-        try:
-            jwks_url = f"https://{self.domain}/.well-known/jwks.json"
+        async with self._jwks_lock:
+            if not force and self._jwks_cache and time.monotonic() < self._cache_expiry:
+                return self._jwks_cache
             
-            async with httpx.AsyncClient() as client:
-                response = await client.get(jwks_url)
+            try:
+                jwks_url = f"https://{self.domain}/.well-known/jwks.json"
+                
+                response = await _get_http_client().get(jwks_url)
                 response.raise_for_status()
                 
-                self._jwks_cache = response.json()
-                self._cache_expiry = datetime.now(timezone.utc) + timedelta(hours=1)
+                jwks = _json_loads(response.content)
+                self._signing_keys = _index_signing_keys(jwks)
+                self._jwks_cache = jwks
+                self._cache_expiry = time.monotonic() + 3600
                 
                 return self._jwks_cache
                 
-        except Exception as e:
-            raise TokenValidationError(f"Failed to fetch Auth0 JWKS: {e}")
+            except Exception as e:
+                raise ProviderUnavailableError(f"Failed to fetch Auth0 JWKS: {e}")
     
     def get_provider_name(self) -> str:
         return "auth0"
+    
+    def expected_issuer(self) -> Optional[str]:
+        return self.issuer
+    
+    async def refresh_signing_keys(self) -> None:
+        await self._get_auth0_jwks(force=True)
 
 class GitHubProvider(ExternalProvider):
     """
@@ -359,6 +522,7 @@ class GitHubProvider(ExternalProvider):
     """
     
     GITHUB_USER_URL = "https://api.github.com/user"
+    GITHUB_EMAILS_URL = "https://api.github.com/user/emails"
     
     def __init__(self):
         """Initialize GitHub provider"""
@@ -375,36 +539,75 @@ class GitHubProvider(ExternalProvider):
             ExternalUserInfo with GitHub user data
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    self.GITHUB_USER_URL,
-                    headers={
-                        "Authorization": f"Bearer {token}",
-                        "Accept": "application/vnd.github.v3+json"
-                    }
+            headers = {
+                "Authorization": f"Bearer {token}",
+                "Accept": "application/vnd.github.v3+json"
+            }
+            
+            client = _get_http_client()
+            response = await client.get(self.GITHUB_USER_URL, headers=headers)
+            
+            if response.status_code != 200:
+                # GitHub reports an exhausted rate limit as 403 with no remaining quota
+                rate_limited = (
+                    response.status_code == 403
+                    and response.headers.get("x-ratelimit-remaining") == "0"
                 )
-                
-                if response.status_code != 200:
-                    raise TokenValidationError(f"GitHub API error: {response.status_code}")
-                
-                user_data = response.json()
-                
-                return ExternalUserInfo(
-                    provider="github",
-                    provider_user_id=str(user_data["id"]),
-                    email=user_data.get("email", "") or f"{user_data['login']}@github.local",
-                    name=user_data.get("name") or user_data.get("login"),
-                    picture=user_data.get("avatar_url"),
-                    email_verified=True,  # GitHub emails are considered verified
-                    raw_claims=user_data
+                error_type = (
+                    ProviderUnavailableError
+                    if rate_limited or _is_transient_status(response)
+                    else TokenValidationError
                 )
-                
+                raise error_type(f"GitHub API error: {response.status_code}")
+            
+            user_data = _json_loads(response.content)
+            # The email list costs another rate-limited call; only ask when the profile hides it
+            email = (
+                user_data.get("email")
+                or await self._primary_email(client, headers)
+                or f"{user_data['login']}@github.local"
+            )
+            
+            return ExternalUserInfo(
+                provider="github",
+                provider_user_id=str(user_data["id"]),
+                email=email,
+                name=user_data.get("name") or user_data.get("login"),
+                picture=user_data.get("avatar_url"),
+                email_verified=True,  # GitHub emails are considered verified
+                raw_claims=user_data
+            )
+            
         except httpx.RequestError as e:
-            raise TokenValidationError(f"GitHub API request failed: {e}")
+            raise ProviderUnavailableError(f"GitHub API request failed: {e}")
+        except ProviderUnavailableError as e:
+            logger.warning(f"GitHub unavailable for token validation: {e}")
+            raise
         except Exception as e:
             logger.error(f"GitHub token validation failed: {e}")
             raise TokenValidationError(f"GitHub validation error: {e}")
     
+    async def _primary_email(self, client: httpx.AsyncClient, headers: Dict[str, str]) -> Optional[str]:
+        """Verified primary address from /user/emails, if readable"""
+        # The endpoint needs the user:email scope; anything else falls back
+        try:
+            response = await client.get(self.GITHUB_EMAILS_URL, headers=headers)
+        except httpx.RequestError:
+            return None
+        if response.status_code != 200:
+            return None
+        try:
+            emails = _json_loads(response.content)
+        except ValueError:
+            return None
+        if not isinstance(emails, list):
+            return None
+        return next(
+            (entry.get("email") for entry in emails
+             if isinstance(entry, dict) and entry.get("primary") and entry.get("verified")),
+            None
+        )
+    
     def get_provider_name(self) -> str:
         return "github"
 
@@ -415,6 +618,9 @@ class ExternalProviderRegistry:
     
     def __init__(self):
         self.providers: Dict[str, ExternalProvider] = {}
+        self._issuer_providers: Dict[str, str] = {}
+        self._validated: OrderedDict = OrderedDict()
+        self._rejected: OrderedDict = OrderedDict()
         logger.info("ExternalProviderRegistry initialized")
     
     def register_provider(self, provider: ExternalProvider) -> None:
@@ -426,8 +632,30 @@ class ExternalProviderRegistry:
         """
         name = provider.get_provider_name()
         self.providers[name] = provider
+        issuer = provider.expected_issuer()
+        if issuer:
+            self._issuer_providers[issuer] = name
+        
+        # Start key refresh now if registered from async code, else on start()
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            provider.start()
+        
         logger.info(f"Registered external provider: {name}")
     
+    def start(self) -> None:
+        """Start background work for all providers; call from a running event loop"""
+        for provider in self.providers.values():
+            provider.start()
+    
+    async def stop(self) -> None:
+        """Stop background work for all providers"""
+        for provider in self.providers.values():
+            await provider.stop()
+    
     def get_provider(self, provider_name: str) -> Optional[ExternalProvider]:
         """
         Get provider by name
@@ -453,24 +681,104 @@ class ExternalProviderRegistry:
             
         Raises:
             TokenValidationError: If no provider can validate the token
+            ProviderUnavailableError: If a provider couldn't be consulted (not cached)
         """
+        cache_key = _token_cache_key(token)
+        user_info = _cache_get(self._validated, cache_key)
+        if user_info is not None:
+            return user_info.copy()
+        rejection = _cache_get(self._rejected, cache_key)
+        if rejection is not None:
+            raise TokenValidationError(rejection)
+        
+        try:
+            user_info = await self._validate_uncached(token, provider_hint)
+        except ProviderUnavailableError:
+            # Not a verdict on the token; the next attempt asks the providers again
+            raise
+        except TokenValidationError as e:
+            _cache_set(self._rejected, cache_key, str(e), NEGATIVE_CACHE_TTL)
+            raise
+        
+        # Never serve a cached success past the token's own expiry
+        exp = user_info.raw_claims.get("exp")
+        if isinstance(exp, (int, float)):
+            ttl = min(POSITIVE_CACHE_TTL, exp - time.time())
+        else:
+            ttl = OPAQUE_TOKEN_CACHE_TTL
+        if ttl > 0:
+            _cache_set(self._validated, cache_key, user_info.copy(), ttl)
+        return user_info
+    
+    async def _validate_uncached(self,
+                                 token: str,
+                                 provider_hint: Optional[str]) -> ExternalUserInfo:
+        """Validate against the providers, without consulting the caches"""
+        # JWTs from a known issuer go straight to that provider
+        provider_name = self._provider_for_issuer(token)
+        if provider_name:
+            return await self.providers[provider_name].validate_token(token)
+        
         # Try hinted provider first
+        hint_unavailable = None
         if provider_hint and provider_hint in self.providers:
             try:
                 return await self.providers[provider_hint].validate_token(token)
+            except ProviderUnavailableError as e:
+                hint_unavailable = e  # The hinted provider may yet accept the token
             except TokenValidationError:
-                pass  # Fall back to trying all providers
+                pass  # Fall back to the remaining providers
         
-        # Try all providers
-        last_error = None
-        for provider_name, provider in self.providers.items():
-            try:
-                return await provider.validate_token(token)
-            except TokenValidationError as e:
-                last_error = e
-                continue
+        # Race the remaining providers; the first success wins
+        providers = [
+            provider for name, provider in self.providers.items() if name != provider_hint
+        ]
+        try:
+            return await self._validate_concurrently(token, providers)
+        except ProviderUnavailableError:
+            raise
+        except TokenValidationError:
+            if hint_unavailable is not None:
+                raise ProviderUnavailableError(f"No provider could validate token: {hint_unavailable}")
+            raise
+    
+    def _provider_for_issuer(self, token: str) -> Optional[str]:
+        """Route a JWT by its unverified iss claim; the provider still verifies it"""
+        if token.count(".") != 2:
+            return None
+        try:
+            payload = jwt.decode(token, options={"verify_signature": False})
+        except jwt.InvalidTokenError:
+            return None
+        issuer = payload.get("iss")
+        return self._issuer_providers.get(issuer) if isinstance(issuer, str) else None
+    
+    async def _validate_concurrently(self,
+                                     token: str,
+                                     providers: List[ExternalProvider]) -> ExternalUserInfo:
+        """Validate against all providers in parallel, cancelling the rest on first success"""
+        tasks = [asyncio.create_task(provider.validate_token(token)) for provider in providers]
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # Prefer registration order when several finish together
+                for task in tasks:
+                    if task in done and not isinstance(task.exception(), TokenValidationError):
+                        return task.result()
+        finally:
+            for task in pending:
+                task.cancel()
         
-        # No provider could validate the token
+        # No provider could validate the token; unless every one of them
+        # rejected it outright, the answer is "try again", not "invalid"
+        errors = [task.exception() for task in tasks]
+        unavailable = next(
+            (error for error in errors if isinstance(error, ProviderUnavailableError)), None
+        )
+        if unavailable is not None:
+            raise ProviderUnavailableError(f"No provider could validate token: {unavailable}")
+        last_error = errors[-1] if errors else None
         raise TokenValidationError(f"No provider could validate token: {last_error}")
     
     def list_providers(self) -> List[str]:
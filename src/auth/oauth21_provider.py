@@ -8,19 +8,48 @@ Implements OAuth 2.1 specification with MCP authorization compliance:
 - Dynamic client registration (RFC 7591)
 """
 
+import asyncio
 import json
 import logging
-from datetime import datetime, timezone
-from typing import Dict, Any, Optional, List, Literal
+from functools import lru_cache, partial
+from typing import Callable, Dict, Any, FrozenSet, Optional, List, Literal, Tuple
 from urllib.parse import urlencode, parse_qs
 import secrets
+import time
 
 from .pkce_verifier import PKCEVerifier, PKCEError
 from .client_authenticator import ClientAuthenticator, ClientContext, ClientAuthenticationError
 from .token_manager import TokenManager, TokenContext, TokenError
 
+# orjson serializes response bodies straight to bytes when installed
+try:
+    from orjson import dumps as _serialize
+except ImportError:
+    def _serialize(obj: Any) -> bytes:
+        """Serialize to a compact JSON response body"""
+        return json.dumps(obj, separators=(",", ":")).encode()
+
 logger = logging.getLogger(__name__)
 
+AUTHORIZATION_CODE_TTL = 600  # seconds
+_AUTH_CODE_KEY_PREFIX = "authcode:"
+
+_SUPPORTED_SCOPES = ("read", "write", "admin")
+_SCOPE_BITS = {scope: 1 << bit for bit, scope in enumerate(_SUPPORTED_SCOPES)}
+
+@lru_cache(maxsize=1024)
+def _parse_scope(scope: str) -> Tuple[int, FrozenSet[str]]:
+    """Split a scope string into a bitmask of supported scopes and a frozenset of the rest"""
+    mask = 0
+    others = set()
+    for name in scope.split():
+        bit = _SCOPE_BITS.get(name)
+        if bit:
+            mask |= bit
+        else:
+            others.add(name)
+    return mask, frozenset(others)
+
 class OAuth21Error(Exception):
     """OAuth 2.1 specific errors"""
     def __init__(self, error: str, description: str = "", error_uri: str = ""):
@@ -44,7 +73,8 @@ class OAuth21Provider:
                  issuer: str,
                  token_manager: TokenManager,
                  client_authenticator: ClientAuthenticator,
-                 client_registry: Dict[str, Dict[str, Any]]):
+                 client_registry: Dict[str, Dict[str, Any]],
+                 redis_client: Optional[Any] = None):
         """
         Initialize OAuth 2.1 provider
         
@@ -53,15 +83,23 @@ class OAuth21Provider:
             token_manager: Token management instance
             client_authenticator: Client authentication handler
             client_registry: Registered client configurations
+            redis_client: Optional redis.Redis client for sharing
+                authorization codes across workers
         """
         self.issuer = issuer
         self.token_manager = token_manager
         self.client_authenticator = client_authenticator
         self.client_registry = client_registry
         
-        # Authorization code store (use Redis/database in production)
+        # Authorization codes live in Redis when a client is given, so they
+        # expire in the store and are shared across workers; otherwise in memory
+        self.redis = redis_client
         self.authorization_codes: Dict[str, Dict[str, Any]] = {}
         
+        # Metadata depends only on the issuer; build and serialize it once
+        self._metadata = self._build_authorization_server_metadata()
+        self._metadata_json = _serialize(self._metadata)
+        
         logger.info(f"OAuth21Provider initialized for issuer: {issuer}")
     
     def handle_authorization_request(self, 
@@ -107,7 +145,7 @@ class OAuth21Provider:
             )
         
         # Validate PKCE method
-        if code_challenge_method not in ["S256", "plain"]:
+        if code_challenge_method not in PKCEVerifier.SUPPORTED_METHODS:
             raise OAuth21Error(
                 "invalid_request",
                 "Invalid code_challenge_method. Must be 'S256' or 'plain'"
@@ -121,17 +159,15 @@ class OAuth21Provider:
         auth_code = self._generate_authorization_code()
         
         # Store authorization data
-        self.authorization_codes[auth_code] = {
+        self._store_authorization_code(auth_code, {
             "client_id": client_id,
             "redirect_uri": redirect_uri,
             "scope": scope,
             "code_challenge": code_challenge,
             "code_challenge_method": code_challenge_method,
             "resource": resource,
-            "expires_at": datetime.now(timezone.utc).timestamp() + 600,  # 10 minutes
-            "used": False,
-            "created_at": datetime.now(timezone.utc)
-        }
+            "expires_at": time.time() + AUTHORIZATION_CODE_TTL
+        })
         
         logger.info(f"Authorization code generated for client {client_id}")
         
@@ -175,6 +211,32 @@ class OAuth21Provider:
                 f"Grant type '{grant_type}' not supported by OAuth 2.1"
             )
     
+    def handle_token_request_bytes(self,
+                                   grant_type: str,
+                                   client_auth: Dict[str, Any],
+                                   **params) -> bytes:
+        """Handle OAuth 2.1 token request, returning the JSON response body"""
+        return _serialize(self.handle_token_request(grant_type, client_auth, **params))
+    
+    async def handle_token_request_async(self,
+                                         grant_type: str,
+                                         client_auth: Dict[str, Any],
+                                         **params) -> Dict[str, Any]:
+        """
+        Handle OAuth 2.1 token request from an event loop
+        
+        Same contract as handle_token_request. For the authorization_code
+        grant, client authentication runs in the default executor while the
+        code is looked up and PKCE verified; other grants run there as a whole.
+        """
+        if grant_type == "authorization_code":
+            return await self._handle_authorization_code_grant_async(client_auth, **params)
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, partial(self.handle_token_request, grant_type, client_auth, **params)
+        )
+    
     def _handle_authorization_code_grant(self,
                                        client_auth: Dict[str, Any],
                                        code: str,
@@ -185,25 +247,81 @@ class OAuth21Provider:
         """Handle authorization code grant with PKCE"""
         
         # Authenticate client
+        client_context = self._authenticate_client(client_auth)
+        
+        # Validate authorization code; consuming it up front makes codes
+        # single-use, so a replayed code is simply unknown
+        auth_data = self._consume_authorization_code(code)
+        self._check_authorization_code(auth_data, client_context, redirect_uri)
+        
+        # Verify PKCE code verifier
+        self._verify_pkce(code_verifier, auth_data)
+        
+        return self._issue_authorization_code_tokens(client_context, auth_data, resource)
+    
+    async def _handle_authorization_code_grant_async(self,
+                                                     client_auth: Dict[str, Any],
+                                                     code: str,
+                                                     redirect_uri: str,
+                                                     code_verifier: str,
+                                                     resource: Optional[str] = None,
+                                                     **kwargs) -> Dict[str, Any]:
+        """Handle authorization code grant, overlapping client auth and PKCE"""
+        loop = asyncio.get_running_loop()
+        client_stage = loop.run_in_executor(None, self._authenticate_client, client_auth)
+        
+        # Peek at the code so PKCE can be verified while the client
+        # authenticates; it is only consumed once the client is known.
+        # PKCE is a single hash, so it runs inline rather than in the executor
         try:
-            client_context = self.client_authenticator.authenticate_client(
+            pending = await self._run_code_store(self._peek_authorization_code, code)
+        except BaseException:
+            client_stage.cancel()
+            raise
+        pkce_error = None
+        if pending is not None:
+            try:
+                self._verify_pkce(code_verifier, pending)
+            except Exception as e:
+                pkce_error = e
+        
+        # Report failures in the same order as the synchronous path
+        client_context = await client_stage
+        
+        auth_data = await self._run_code_store(self._consume_authorization_code, code)
+        self._check_authorization_code(auth_data, client_context, redirect_uri)
+        
+        if pkce_error is not None:
+            raise pkce_error
+        
+        return self._issue_authorization_code_tokens(client_context, auth_data, resource)
+    
+    async def _run_code_store(self, operation: Callable[[str], Any], code: str) -> Any:
+        """Run an authorization code store operation without blocking the event loop"""
+        # The Redis client is synchronous, so its round trips go to the executor
+        if self.redis is None:
+            return operation(code)
+        return await asyncio.get_running_loop().run_in_executor(None, operation, code)
+    
+    def _authenticate_client(self, client_auth: Dict[str, Any]) -> ClientContext:
+        """Authenticate the client of a token request"""
+        try:
+            return self.client_authenticator.authenticate_client(
                 auth_method=client_auth.get("method", "client_secret_basic"),
                 credentials=client_auth.get("credentials", {})
             )
         except ClientAuthenticationError as e:
             raise OAuth21Error("invalid_client", str(e))
-        
-        # Validate authorization code
-        auth_data = self.authorization_codes.get(code)
+    
+    def _check_authorization_code(self,
+                                  auth_data: Optional[Dict[str, Any]],
+                                  client_context: ClientContext,
+                                  redirect_uri: str) -> None:
+        """Check a consumed authorization code against the token request"""
         if not auth_data:
             raise OAuth21Error("invalid_grant", "Invalid authorization code")
         
-        if auth_data["used"]:
-            # Code reuse detected - revoke any issued tokens
-            logger.warning(f"Authorization code reuse detected for client {client_context.client_id}")
-            raise OAuth21Error("invalid_grant", "Authorization code already used")
-        
-        if datetime.now(timezone.utc).timestamp() > auth_data["expires_at"]:
+        if time.time() > auth_data["expires_at"]:
             raise OAuth21Error("invalid_grant", "Authorization code has expired")
         
         if auth_data["client_id"] != client_context.client_id:
@@ -211,24 +329,26 @@ class OAuth21Provider:
         
         if auth_data["redirect_uri"] != redirect_uri:
             raise OAuth21Error("invalid_grant", "Invalid redirect URI")
-        
-        # Verify PKCE code verifier
+    
+    def _verify_pkce(self, code_verifier: str, auth_data: Dict[str, Any]) -> None:
+        """Verify the PKCE code verifier against the stored challenge"""
         try:
             pkce_valid = PKCEVerifier.verify_code_challenge(
                 code_verifier=code_verifier,
                 code_challenge=auth_data["code_challenge"],
                 method=auth_data["code_challenge_method"]  # type: ignore
             )
-            
-            if not pkce_valid:
-                raise OAuth21Error("invalid_grant", "PKCE verification failed")
-                
         except PKCEError as e:
             raise OAuth21Error("invalid_grant", f"PKCE error: {e}")
         
-        # Mark code as used
-        auth_data["used"] = True
-        
+        if not pkce_valid:
+            raise OAuth21Error("invalid_grant", "PKCE verification failed")
+    
+    def _issue_authorization_code_tokens(self,
+                                         client_context: ClientContext,
+                                         auth_data: Dict[str, Any],
+                                         resource: Optional[str]) -> Dict[str, Any]:
+        """Mint the access and refresh tokens for a redeemed authorization code"""
         # Use resource from token request or fallback to authorization request
         final_resource = resource or auth_data["resource"]
         
@@ -276,13 +396,7 @@ class OAuth21Provider:
         """Handle refresh token grant"""
         
         # Authenticate client
-        try:
-            client_context = self.client_authenticator.authenticate_client(
-                auth_method=client_auth.get("method", "client_secret_basic"),
-                credentials=client_auth.get("credentials", {})
-            )
-        except ClientAuthenticationError as e:
-            raise OAuth21Error("invalid_client", str(e))
+        client_context = self._authenticate_client(client_auth)
         
         # Refresh access token
         try:
@@ -337,10 +451,10 @@ class OAuth21Provider:
             
             # Validate scope if required
             if required_scope and token_context.scope:
-                token_scopes = set(token_context.scope.split())
-                required_scopes = set(required_scope.split())
+                token_mask, token_others = _parse_scope(token_context.scope)
+                required_mask, required_others = _parse_scope(required_scope)
                 
-                if not required_scopes.issubset(token_scopes):
+                if token_mask & required_mask != required_mask or not required_others <= token_others:
                     raise OAuth21Error(
                         "insufficient_scope",
                         f"Token missing required scope: {required_scope}"
@@ -409,11 +523,69 @@ class OAuth21Provider:
         except ClientAuthenticationError:
             return {"active": False}
     
+    def introspect_tokens(self,
+                          tokens: List[str],
+                          client_auth: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Introspect a batch of tokens for one client (RFC 7662)
+        
+        The client is authenticated once for the whole batch.
+        
+        Args:
+            tokens: Tokens to introspect
+            client_auth: Client authentication
+            
+        Returns:
+            Token introspection responses in the order of tokens
+        """
+        try:
+            self.client_authenticator.authenticate_client(
+                auth_method=client_auth.get("method", "client_secret_basic"),
+                credentials=client_auth.get("credentials", {})
+            )
+        except ClientAuthenticationError:
+            return [{"active": False} for _ in tokens]
+        
+        return self.token_manager.introspect_tokens(tokens)
+    
     def _validate_redirect_uri(self, redirect_uri: str, client_config: Dict[str, Any]) -> bool:
         """Validate redirect URI against registered URIs"""
-        registered_uris = client_config.get("redirect_uris", [])
+        # Clients register a handful of URIs, so a list scan beats any index
+        # that has to be checked for staleness on every request
+        registered_uris = client_config.get("redirect_uris") or ()
         return redirect_uri in registered_uris
     
+    def _store_authorization_code(self, code: str, auth_data: Dict[str, Any]) -> None:
+        """Save authorization data for a newly issued code"""
+        if self.redis is not None:
+            self.redis.setex(_AUTH_CODE_KEY_PREFIX + code, AUTHORIZATION_CODE_TTL, json.dumps(auth_data))
+            return
+        
+        # Codes share one TTL, so insertion order is expiry order and expired
+        # entries can be dropped from the front
+        codes = self.authorization_codes
+        now = auth_data["expires_at"] - AUTHORIZATION_CODE_TTL
+        while codes:
+            oldest = next(iter(codes))
+            if codes[oldest]["expires_at"] > now:
+                break
+            del codes[oldest]
+        codes[code] = auth_data
+    
+    def _consume_authorization_code(self, code: str) -> Optional[Dict[str, Any]]:
+        """Remove and return authorization data for a code (GETDEL in Redis)"""
+        if self.redis is not None:
+            payload = self.redis.getdel(_AUTH_CODE_KEY_PREFIX + code)
+            return json.loads(payload) if payload is not None else None
+        return self.authorization_codes.pop(code, None)
+    
+    def _peek_authorization_code(self, code: str) -> Optional[Dict[str, Any]]:
+        """Return authorization data for a code without consuming it"""
+        if self.redis is not None:
+            payload = self.redis.get(_AUTH_CODE_KEY_PREFIX + code)
+            return json.loads(payload) if payload is not None else None
+        return self.authorization_codes.get(code)
+    
     def _generate_authorization_code(self) -> str:
         """Generate secure authorization code"""
         return secrets.token_urlsafe(32)
@@ -422,6 +594,15 @@ class OAuth21Provider:
         """
         Get OAuth Authorization Server Metadata (RFC 8414)
         """
+        # Values are immutable, so a shallow copy keeps the cached document intact
+        return dict(self._metadata)
+    
+    def get_authorization_server_metadata_bytes(self) -> bytes:
+        """Authorization server metadata pre-serialized as a JSON response body"""
+        return self._metadata_json
+    
+    def _build_authorization_server_metadata(self) -> Dict[str, Any]:
+        """Build the authorization server metadata document"""
         return {
             "issuer": self.issuer,
             "authorization_endpoint": f"{self.issuer}/oauth/authorize",
@@ -429,20 +610,20 @@ class OAuth21Provider:
             "revocation_endpoint": f"{self.issuer}/oauth/revoke",
             "introspection_endpoint": f"{self.issuer}/oauth/introspect",
             "registration_endpoint": f"{self.issuer}/oauth/register",
-            "response_types_supported": ["code"],
-            "grant_types_supported": ["authorization_code", "refresh_token"],
-            "code_challenge_methods_supported": ["S256", "plain"],
-            "token_endpoint_auth_methods_supported": [
+            "response_types_supported": ("code",),
+            "grant_types_supported": ("authorization_code", "refresh_token"),
+            "code_challenge_methods_supported": ("S256", "plain"),
+            "token_endpoint_auth_methods_supported": (
                 "client_secret_basic",
                 "client_secret_post", 
                 "private_key_jwt",
                 "tls_client_auth"
-            ],
-            "scopes_supported": ["read", "write", "admin"],
-            "response_modes_supported": ["query"],
-            "subject_types_supported": ["public"],
-            "id_token_signing_alg_values_supported": ["HS256", "RS256"],
-            "token_endpoint_auth_signing_alg_values_supported": ["HS256", "RS256"],
+            ),
+            "scopes_supported": _SUPPORTED_SCOPES,
+            "response_modes_supported": ("query",),
+            "subject_types_supported": ("public",),
+            "id_token_signing_alg_values_supported": ("HS256", "RS256"),
+            "token_endpoint_auth_signing_alg_values_supported": ("HS256", "RS256"),
             "resource_indicators_supported": True,
             "pkce_required": True
         }
@@ -451,7 +632,8 @@ class OAuth21Provider:
 def create_oauth21_provider(
     issuer: str,
     secret_key: str,
-    client_registry: Dict[str, Dict[str, Any]]
+    client_registry: Dict[str, Dict[str, Any]],
+    redis_client: Optional[Any] = None
 ) -> OAuth21Provider:
     """Create OAuth 2.1 provider with default configuration"""
     
@@ -465,5 +647,6 @@ def create_oauth21_provider(
         issuer=issuer,
         token_manager=token_manager,
         client_authenticator=client_authenticator,
-        client_registry=client_registry
+        client_registry=client_registry,
+        redis_client=redis_client
     )
\ No newline at end of file
@@ -12,7 +12,7 @@ import hashlib
 import secrets
 import string
 from dataclasses import dataclass
-from typing import Literal, Optional
+from typing import Iterable, List, Literal, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
@@ -41,6 +41,12 @@ class PKCEVerifier:
     # Valid characters for code_verifier per RFC 7636
     VALID_CHARS = string.ascii_letters + string.digits + "-._~"
     
+    # str.translate table deleting valid characters; whatever remains is invalid
+    _STRIP_VALID_CHARS = str.maketrans('', '', VALID_CHARS)
+    
+    # Code challenge methods accepted by OAuth 2.1
+    SUPPORTED_METHODS = frozenset({"S256", "plain"})
+    
     MIN_VERIFIER_LENGTH = 43
     MAX_VERIFIER_LENGTH = 128
     
@@ -64,10 +70,10 @@ class PKCEVerifier:
                 f"and {cls.MAX_VERIFIER_LENGTH} characters"
             )
         
-        # Use cryptographically secure random generation
-        code_verifier = ''.join(
-            secrets.choice(cls.VALID_CHARS) for _ in range(length)
-        )
+        # One bulk draw from the CSPRNG; base64url output (A-Z a-z 0-9 - _)
+        # is a subset of the RFC 7636 unreserved characters
+        raw = secrets.token_bytes((length * 3 + 3) // 4)
+        code_verifier = base64.urlsafe_b64encode(raw).decode('ascii')[:length]
         
         logger.debug(f"Generated code verifier of length {len(code_verifier)}")
         return code_verifier
@@ -92,22 +98,32 @@ class PKCEVerifier:
             PKCEError: If verifier is invalid or method unsupported
         """
         cls._validate_code_verifier(code_verifier)
+        code_challenge = cls._compute_challenge_unchecked(code_verifier, method)
+        
+        logger.debug(f"Generated code challenge using {method} method")
+        return code_challenge
+    
+    @classmethod
+    def _compute_challenge_unchecked(cls, code_verifier: str, method: str) -> str:
+        """Derive the code challenge from an already validated verifier"""
+        return cls._compute_challenge_bytes(code_verifier, method).decode('ascii')
+    
+    @staticmethod
+    def _compute_challenge_bytes(code_verifier: str, method: str) -> bytes:
+        """Derive the code challenge as ASCII bytes from an already validated verifier"""
+        verifier_bytes = code_verifier.encode('ascii')
         
         if method == "S256":
             # SHA256 hash and base64url encode
-            digest = hashlib.sha256(code_verifier.encode('ascii')).digest()
-            code_challenge = base64.urlsafe_b64encode(digest).decode('ascii').rstrip('=')
-            
-        elif method == "plain":
+            digest = hashlib.sha256(verifier_bytes).digest()
+            return base64.urlsafe_b64encode(digest).rstrip(b'=')
+        
+        if method == "plain":
             # Use code verifier directly (not recommended for production)
             logger.warning("Using 'plain' PKCE method - S256 is recommended for security")
-            code_challenge = code_verifier
-            
-        else:
-            raise PKCEError(f"Unsupported code challenge method: {method}")
+            return verifier_bytes
         
-        logger.debug(f"Generated code challenge using {method} method")
-        return code_challenge
+        raise PKCEError(f"Unsupported code challenge method: {method}")
     
     @classmethod
     def create_pkce_challenge(
@@ -162,11 +178,12 @@ class PKCEVerifier:
                 logger.error("Empty code challenge provided")
                 return False
             
-            # Generate expected challenge
-            expected_challenge = cls.generate_code_challenge(code_verifier, method)
+            # Generate expected challenge (verifier already validated above)
+            expected_challenge = cls._compute_challenge_bytes(code_verifier, method)
             
-            # Constant-time comparison to prevent timing attacks
-            is_valid = secrets.compare_digest(expected_challenge, code_challenge)
+            # Constant-time comparison to prevent timing attacks; a non-ASCII
+            # challenge cannot match and raises here
+            is_valid = secrets.compare_digest(expected_challenge, code_challenge.encode('ascii'))
             
             if is_valid:
                 logger.info("PKCE verification successful")
@@ -179,6 +196,36 @@ class PKCEVerifier:
             logger.error(f"PKCE verification error: {e}")
             return False
     
+    @classmethod
+    def verify_batch(cls, pairs: Iterable[Tuple[str, str, str]]) -> List[bool]:
+        """
+        Verify many code verifiers against their challenges
+        
+        Applies the same checks as verify_code_challenge, logging once for
+        the batch rather than per pair. hashlib.sha256 uses OpenSSL, which
+        picks up SHA extensions (SHA-NI) on CPUs that have them.
+        
+        Args:
+            pairs: (code_verifier, code_challenge, method) triples
+            
+        Returns:
+            Verification result for each triple, in input order
+        """
+        results = []
+        for code_verifier, code_challenge, method in pairs:
+            try:
+                cls._validate_code_verifier(code_verifier)
+                results.append(bool(code_challenge) and secrets.compare_digest(
+                    cls._compute_challenge_bytes(code_verifier, method),
+                    code_challenge.encode('ascii')
+                ))
+            except Exception as e:
+                logger.debug(f"PKCE batch verification error: {e}")
+                results.append(False)
+        
+        logger.info(f"PKCE batch verification: {sum(results)}/{len(results)} succeeded")
+        return results
+    
     @classmethod
     def _validate_code_verifier(cls, code_verifier: str) -> None:
         """
@@ -200,10 +247,10 @@ class PKCEVerifier:
             )
         
         # Check for invalid characters
-        invalid_chars = set(code_verifier) - set(cls.VALID_CHARS)
+        invalid_chars = code_verifier.translate(cls._STRIP_VALID_CHARS)
         if invalid_chars:
             raise PKCEError(
-                f"Code verifier contains invalid characters: {sorted(invalid_chars)}"
+                f"Code verifier contains invalid characters: {sorted(set(invalid_chars))}"
             )
         
         logger.debug("Code verifier validation passed")
@@ -223,7 +270,7 @@ def verify_pkce(
     method: str = "S256"
 ) -> bool:
     """Verify PKCE challenge with type conversion"""
-    if method not in ["S256", "plain"]:
+    if method not in PKCEVerifier.SUPPORTED_METHODS:
         logger.error(f"Invalid PKCE method: {method}")
         return False
     
@@ -21,7 +21,7 @@ import base64
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(slots=True)
 class TokenContext:
     """Token context with OAuth 2.1 compliance"""
     access_token: str
@@ -378,6 +378,21 @@ class TokenManager:
         except TokenError:
             return {"active": False}
     
+    def introspect_tokens(self, tokens: List[str]) -> List[Dict[str, Any]]:
+        """
+        Introspect a batch of tokens
+        
+        Repeated tokens in the batch are validated once.
+        
+        Args:
+            tokens: Tokens to introspect
+            
+        Returns:
+            Introspection responses in the order of tokens
+        """
+        responses = {token: self.introspect_token(token) for token in dict.fromkeys(tokens)}
+        return [dict(responses[token]) for token in tokens]
+    
     def cleanup_expired_tokens(self) -> int:
         """
         Clean up expired tokens from memory
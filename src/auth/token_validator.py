@@ -19,6 +19,7 @@ from .external_providers import (
     ExternalProviderRegistry, 
     ExternalUserInfo, 
     TokenValidationError,
+    close_http_client,
     create_google_provider,
     create_auth0_provider,
     create_github_provider
@@ -77,6 +78,7 @@ class TokenValidationService:
         self.provider_registry = ExternalProviderRegistry()
         self.default_permissions = default_permissions or ["read", "write"]
         self.tenant_mapping = tenant_mapping or {}
+        self._started = False
         
         # Initialize configured providers
         if provider_configs:
@@ -84,6 +86,25 @@ class TokenValidationService:
         
         logger.info("TokenValidationService initialized")
     
+    async def start(self) -> None:
+        """Start background provider work (signing key refresh)"""
+        if not self._started:
+            self._started = True
+            self.provider_registry.start()
+    
+    async def close(self) -> None:
+        """Stop background provider work and release the provider HTTP client"""
+        self._started = False
+        await self.provider_registry.stop()
+        await close_http_client()
+    
+    async def __aenter__(self) -> "TokenValidationService":
+        await self.start()
+        return self
+    
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+    
     async def validate_token(self, 
                            token: str, 
                            provider_hint: Optional[str] = None) -> MCPUserContext:
@@ -100,6 +121,10 @@ class TokenValidationService:
         Raises:
             TokenValidationError: If token validation fails
         """
+        # Providers registered before the event loop existed start on first use
+        if not self._started:
+            await self.start()
+        
         try:
             # Validate token with external provider
             external_user = await self.provider_registry.validate_token(
@@ -1,9 +1,6 @@
-import asyncio
 from typing import Optional
 
 from .database_interface import DatabaseInterface
-from .sqlite_database import SQLiteDatabase
-from .tinydb_database import TinyDBDatabase
 from .config import Config
 
 class DatabaseFactory:
@@ -13,7 +10,9 @@ class DatabaseFactory:
     async def create_database(config: Config) -> DatabaseInterface:
         """Create and initialize appropriate database instance based on configuration"""
         
+        # Backends are imported on demand so callers only pay for the driver they use
         if config.database_type == "sqlite":
+            from .sqlite_database import SQLiteDatabase
             db = SQLiteDatabase(
                 db_path=config.database_path,
                 encryption_key=getattr(config, 'encryption_key', None)
@@ -22,6 +21,7 @@ class DatabaseFactory:
             return db
             
         elif config.database_type == "tinydb":
+            from .tinydb_database import TinyDBDatabase
             db = TinyDBDatabase(
                 db_path=config.database_path,
                 encryption_key=getattr(config, 'encryption_key', None)
@@ -48,11 +48,13 @@ def get_database() -> DatabaseInterface:
     config = get_config()
     
     if config.database.type == "sqlite":
+        from .sqlite_database import SQLiteDatabase
         return SQLiteDatabase(
             db_path=config.database.path,
             encryption_key=config.database.encryption_key
         )
     elif config.database.type == "tinydb":
+        from .tinydb_database import TinyDBDatabase
         return TinyDBDatabase(
             db_path=config.database.path,
             encryption_key=config.database.encryption_key
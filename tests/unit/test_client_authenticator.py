@@ -0,0 +1,84 @@
+"""
+Unit tests for OAuth 2.1 client authentication
+"""
+
+import base64
+
+import pytest
+
+from src.auth.client_authenticator import ClientAuthenticator, ClientAuthenticationError
+
+
+def basic_credentials(client_id, client_secret):
+    """Credentials for client_secret_basic"""
+    token = base64.b64encode(f"{client_id}:{client_secret}".encode()).decode()
+    return {"authorization_header": f"Basic {token}"}
+
+
+@pytest.fixture
+def client_registry():
+    """Registry with one confidential client"""
+    return {"client-1": {"client_secret": "s3cret"}}
+
+
+@pytest.fixture
+def authenticator(client_registry):
+    """Client authenticator over the shared registry"""
+    return ClientAuthenticator(client_registry, "https://auth.example.com/oauth/token")
+
+
+class TestAuthenticationCache:
+    """Test caching of successful client authentications"""
+    
+    def test_repeat_authentication_hits_cache(self, authenticator):
+        """Test a repeated authentication is answered from the cache"""
+        credentials = basic_credentials("client-1", "s3cret")
+        
+        first = authenticator.authenticate_client("client_secret_basic", credentials)
+        second = authenticator.authenticate_client("client_secret_basic", credentials)
+        
+        assert first.client_id == second.client_id == "client-1"
+        assert len(authenticator._auth_cache) == 1
+    
+    def test_wrong_secret_not_served_from_cache(self, authenticator):
+        """Test a cached success doesn't accept different credentials"""
+        authenticator.authenticate_client("client_secret_basic", basic_credentials("client-1", "s3cret"))
+        
+        with pytest.raises(ClientAuthenticationError):
+            authenticator.authenticate_client("client_secret_basic", basic_credentials("client-1", "guess"))
+    
+    def test_rotated_secret_invalidates_cache(self, authenticator, client_registry):
+        """Test the old secret stops working once the registry entry is rotated"""
+        credentials = basic_credentials("client-1", "s3cret")
+        authenticator.authenticate_client("client_secret_basic", credentials)
+        
+        client_registry["client-1"]["client_secret"] = "rotated"
+        
+        with pytest.raises(ClientAuthenticationError):
+            authenticator.authenticate_client("client_secret_basic", credentials)
+        assert authenticator.authenticate_client(
+            "client_secret_basic", basic_credentials("client-1", "rotated")
+        ).client_id == "client-1"
+    
+    def test_deleted_client_invalidates_cache(self, authenticator, client_registry):
+        """Test a deleted client can't authenticate from the cache"""
+        credentials = basic_credentials("client-1", "s3cret")
+        authenticator.authenticate_client("client_secret_basic", credentials)
+        
+        del client_registry["client-1"]
+        
+        with pytest.raises(ClientAuthenticationError):
+            authenticator.authenticate_client("client_secret_basic", credentials)
+    
+    def test_cached_metadata_is_not_shared(self, authenticator):
+        """Test callers can't alter the metadata later cache hits see"""
+        credentials = basic_credentials("client-1", "s3cret")
+        
+        first = authenticator.authenticate_client("client_secret_basic", credentials)
+        first.metadata["tampered"] = True
+        second = authenticator.authenticate_client("client_secret_basic", credentials)
+        second.metadata["tampered"] = True
+        third = authenticator.authenticate_client("client_secret_basic", credentials)
+        
+        assert "tampered" not in third.metadata
+        assert "auth_time" in third.metadata
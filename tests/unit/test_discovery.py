@@ -0,0 +1,59 @@
+"""
+Unit tests for OAuth 2.1 discovery metadata
+"""
+
+import json
+
+import pytest
+
+from src.auth.discovery import DiscoveryService
+
+
+@pytest.fixture
+def discovery():
+    """Discovery service with explicit scopes and resources"""
+    return DiscoveryService(
+        "https://auth.example.com",
+        supported_scopes=["read", "write"],
+        supported_resources=["https://auth.example.com/mcp"]
+    )
+
+
+class TestDiscoveryMetadata:
+    """Test the memoized discovery documents"""
+    
+    def test_authorization_server_metadata_matches_bytes(self, discovery):
+        """Test the serialized document agrees with the returned one"""
+        metadata = discovery.get_authorization_server_metadata()
+        
+        assert json.loads(discovery.get_authorization_server_metadata_bytes()) == json.loads(json.dumps(metadata))
+        assert metadata["scopes_supported"] == ("read", "write")
+    
+    @pytest.mark.parametrize("getter", [
+        lambda service: service.get_authorization_server_metadata(),
+        lambda service: service.get_openid_configuration(),
+        lambda service: service.get_protected_resource_metadata("https://auth.example.com/mcp"),
+        lambda service: service.get_server_capabilities(),
+    ])
+    def test_caller_cannot_corrupt_cache(self, discovery, getter):
+        """Test mutating a returned document leaves later results intact"""
+        expected = json.dumps(getter(discovery), sort_keys=True)
+        
+        metadata = getter(discovery)
+        for key in list(metadata):
+            if isinstance(metadata[key], dict):
+                metadata[key].clear()
+        metadata["injected"] = True
+        metadata.pop("issuer", None)
+        
+        assert json.dumps(getter(discovery), sort_keys=True) == expected
+    
+    def test_metadata_does_not_alias_constructor_lists(self):
+        """Test later edits to the caller's scope list don't leak into the documents"""
+        scopes = ["read"]
+        discovery = DiscoveryService("https://auth.example.com", supported_scopes=scopes)
+        
+        scopes.append("admin")
+        
+        assert discovery.get_authorization_server_metadata()["scopes_supported"] == ("read",)
+        assert discovery.get_protected_resource_metadata("https://r.example.com")["scopes_supported"] == ("read",)
@@ -0,0 +1,153 @@
+"""
+Unit tests for external identity provider token validation
+"""
+
+import httpx
+import pytest
+
+from src.auth import external_providers
+from src.auth.external_providers import (
+    ExternalProviderRegistry,
+    GitHubProvider,
+    ProviderUnavailableError,
+    TokenValidationError
+)
+
+
+class GitHubStub:
+    """Mock transport handler for the GitHub user API"""
+    
+    def __init__(self):
+        self.status = 200
+        self.calls = 0
+        self.paths = []
+        self.profile_email = "octo@corp.com"
+        self.emails_body = b"[]"
+    
+    def __call__(self, request):
+        self.calls += 1
+        self.paths.append(request.url.path)
+        if self.status != 200:
+            return httpx.Response(self.status)
+        if request.headers["Authorization"] != "Bearer good-token":
+            return httpx.Response(401)
+        if request.url.path == "/user/emails":
+            return httpx.Response(200, content=self.emails_body)
+        return httpx.Response(200, json={"id": 7, "login": "octo", "email": self.profile_email})
+
+
+@pytest.fixture
+def github():
+    """GitHub API stub served through the shared provider HTTP client"""
+    stub = GitHubStub()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(stub))
+    original = external_providers._http_client
+    external_providers._http_client = client
+    yield stub
+    external_providers._http_client = original
+
+
+@pytest.fixture
+def registry(github):
+    """Provider registry with GitHub registered"""
+    registry = ExternalProviderRegistry()
+    registry.register_provider(GitHubProvider())
+    return registry
+
+
+class TestProviderCaching:
+    """Test the registry's validation result caches"""
+    
+    @pytest.mark.asyncio
+    async def test_success_cached(self, registry, github):
+        """Test a validated token is answered from memory"""
+        await registry.validate_token("good-token")
+        calls = github.calls
+        
+        user = await registry.validate_token("good-token")
+        
+        assert user.provider_user_id == "7"
+        assert github.calls == calls
+    
+    @pytest.mark.asyncio
+    async def test_cached_user_info_is_copied(self, registry):
+        """Test callers can't alter a cached result"""
+        first = await registry.validate_token("good-token")
+        first.email = "evil@example.com"
+        first.raw_claims["login"] = "evil"
+        
+        second = await registry.validate_token("good-token")
+        
+        assert second is not first
+        assert second.email == "octo@corp.com"
+        assert second.raw_claims["login"] == "octo"
+    
+    @pytest.mark.asyncio
+    async def test_opaque_token_cached_briefly(self, registry):
+        """Test tokens without exp get the short opaque token TTL"""
+        await registry.validate_token("good-token")
+        
+        expiry, _ = registry._validated[external_providers._token_cache_key("good-token")]
+        
+        ttl = expiry - external_providers.time.monotonic()
+        assert 0 < ttl <= external_providers.OPAQUE_TOKEN_CACHE_TTL
+    
+    @pytest.mark.asyncio
+    async def test_rejection_cached(self, registry, github):
+        """Test a definitive rejection is answered from memory"""
+        with pytest.raises(TokenValidationError):
+            await registry.validate_token("bad-token")
+        calls = github.calls
+        
+        with pytest.raises(TokenValidationError):
+            await registry.validate_token("bad-token")
+        
+        assert github.calls == calls
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("status", [429, 500, 503])
+    async def test_transient_failure_not_cached(self, registry, github, status):
+        """Test outages and rate limits don't lock a valid token out"""
+        github.status = status
+        with pytest.raises(ProviderUnavailableError):
+            await registry.validate_token("good-token")
+        
+        github.status = 200
+        user = await registry.validate_token("good-token")
+        
+        assert user.provider == "github"
+        assert len(registry._rejected) == 0
+
+
+class TestGitHubEmail:
+    """Test how the GitHub provider resolves a user's email"""
+    
+    @pytest.mark.asyncio
+    async def test_public_email_skips_email_list(self, github):
+        """Test a public profile email costs no extra API call"""
+        user = await GitHubProvider().validate_token("good-token")
+        
+        assert user.email == "octo@corp.com"
+        assert github.paths == ["/user"]
+    
+    @pytest.mark.asyncio
+    async def test_hidden_email_uses_verified_primary(self, github):
+        """Test a hidden profile email falls back to the verified primary address"""
+        github.profile_email = None
+        github.emails_body = b'[{"email": "x@y.com", "primary": false, "verified": true},' \
+                             b' {"email": "octo@real.com", "primary": true, "verified": true}]'
+        
+        user = await GitHubProvider().validate_token("good-token")
+        
+        assert user.email == "octo@real.com"
+        assert github.paths == ["/user", "/user/emails"]
+    
+    @pytest.mark.asyncio
+    async def test_unreadable_email_list_falls_back(self, github):
+        """Test a malformed email list doesn't fail a valid token"""
+        github.profile_email = None
+        github.emails_body = b"<html>not json"
+        
+        user = await GitHubProvider().validate_token("good-token")
+        
+        assert user.email == "octo@github.local"
@@ -0,0 +1,171 @@
+"""
+Unit tests for the OAuth 2.1 authorization server
+"""
+
+import base64
+import hashlib
+import json
+import threading
+
+import pytest
+
+from src.auth.oauth21_provider import (
+    AUTHORIZATION_CODE_TTL,
+    OAuth21Error,
+    create_oauth21_provider
+)
+
+CODE_VERIFIER = "v" * 50
+CODE_CHALLENGE = base64.urlsafe_b64encode(
+    hashlib.sha256(CODE_VERIFIER.encode()).digest()
+).rstrip(b"=").decode()
+CLIENT_AUTH = {
+    "method": "client_secret_post",
+    "credentials": {"client_id": "client-1", "client_secret": "s3cret"}
+}
+
+
+class FakeRedis:
+    """Synchronous Redis stand-in covering the commands the code store uses"""
+    
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+        self.calls = []
+    
+    def _record(self, command):
+        self.calls.append((command, threading.current_thread() is threading.main_thread()))
+    
+    def setex(self, key, ttl, value):
+        self._record("setex")
+        self.data[key] = value.encode()
+        self.ttls[key] = ttl
+    
+    def get(self, key):
+        self._record("get")
+        return self.data.get(key)
+    
+    def getdel(self, key):
+        self._record("getdel")
+        return self.data.pop(key, None)
+
+
+@pytest.fixture
+def client_registry():
+    """Registry with one confidential client"""
+    return {
+        "client-1": {
+            "client_secret": "s3cret",
+            "redirect_uris": ["https://app.example.com/cb"]
+        }
+    }
+
+
+@pytest.fixture
+def redis_client():
+    """Fake Redis backing the authorization code store"""
+    return FakeRedis()
+
+
+@pytest.fixture
+def provider(client_registry, redis_client):
+    """OAuth 2.1 provider storing codes in Redis"""
+    return create_oauth21_provider("https://auth.example.com", "k" * 32, client_registry, redis_client)
+
+
+def authorize(provider, redirect_uri="https://app.example.com/cb"):
+    """Run an authorization request and return the issued code"""
+    response = provider.handle_authorization_request(
+        "client-1",
+        redirect_uri,
+        scope="read",
+        code_challenge=CODE_CHALLENGE,
+        code_challenge_method="S256"
+    )
+    return response["params"]["code"]
+
+
+class TestRedisCodeStore:
+    """Test authorization codes kept in Redis"""
+    
+    def test_code_stored_with_ttl(self, provider, redis_client):
+        """Test codes are written with SETEX so Redis expires them"""
+        code = authorize(provider)
+        
+        key = f"authcode:{code}"
+        assert key in redis_client.data
+        assert redis_client.ttls[key] == AUTHORIZATION_CODE_TTL
+        assert provider.authorization_codes == {}
+    
+    def test_code_redeemed_once(self, provider, redis_client):
+        """Test a code is consumed by redemption and can't be replayed"""
+        code = authorize(provider)
+        params = {"code": code, "redirect_uri": "https://app.example.com/cb", "code_verifier": CODE_VERIFIER}
+        
+        tokens = provider.handle_token_request("authorization_code", CLIENT_AUTH, **params)
+        
+        assert tokens["token_type"] == "Bearer"
+        assert redis_client.data == {}
+        with pytest.raises(OAuth21Error) as exc_info:
+            provider.handle_token_request("authorization_code", CLIENT_AUTH, **params)
+        assert exc_info.value.error == "invalid_grant"
+    
+    def test_failed_pkce_still_consumes_code(self, provider, redis_client):
+        """Test a wrong verifier burns the code"""
+        code = authorize(provider)
+        
+        with pytest.raises(OAuth21Error) as exc_info:
+            provider.handle_token_request(
+                "authorization_code", CLIENT_AUTH,
+                code=code, redirect_uri="https://app.example.com/cb", code_verifier="w" * 50
+            )
+        
+        assert exc_info.value.description == "PKCE verification failed"
+        assert redis_client.data == {}
+    
+    @pytest.mark.asyncio
+    async def test_async_redemption_keeps_redis_off_the_loop(self, provider, redis_client):
+        """Test the async path sends Redis calls to the executor and redeems once"""
+        code = authorize(provider)
+        params = {"code": code, "redirect_uri": "https://app.example.com/cb", "code_verifier": CODE_VERIFIER}
+        redis_client.calls.clear()
+        
+        tokens = await provider.handle_token_request_async("authorization_code", CLIENT_AUTH, **params)
+        
+        assert tokens["token_type"] == "Bearer"
+        assert redis_client.calls == [("get", False), ("getdel", False)]
+        with pytest.raises(OAuth21Error) as exc_info:
+            await provider.handle_token_request_async("authorization_code", CLIENT_AUTH, **params)
+        assert exc_info.value.description == "Invalid authorization code"
+
+
+class TestRedirectUriIndex:
+    """Test the per-client redirect URI index"""
+    
+    def test_in_place_edits_are_seen(self, provider, client_registry):
+        """Test appending to or removing from redirect_uris takes effect"""
+        redirect_uris = client_registry["client-1"]["redirect_uris"]
+        
+        redirect_uris.append("https://app.example.com/other")
+        assert authorize(provider, "https://app.example.com/other")
+        
+        redirect_uris.remove("https://app.example.com/cb")
+        with pytest.raises(OAuth21Error) as exc_info:
+            authorize(provider)
+        assert exc_info.value.description == "Invalid redirect URI"
+
+
+class TestAuthorizationServerMetadata:
+    """Test the prebuilt authorization server metadata"""
+    
+    def test_caller_cannot_corrupt_metadata(self, provider):
+        """Test mutating the returned document leaves the cached one and its JSON in agreement"""
+        metadata = provider.get_authorization_server_metadata()
+        metadata["issuer"] = "https://evil.example.com"
+        metadata["injected"] = True
+        
+        fresh = provider.get_authorization_server_metadata()
+        
+        assert fresh["issuer"] == "https://auth.example.com"
+        assert "injected" not in fresh
+        assert json.loads(provider.get_authorization_server_metadata_bytes()) == json.loads(json.dumps(fresh))